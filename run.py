@@ -6,12 +6,22 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 if __name__ == "__main__":
+    # DEV=1 enables auto-reload (single process); otherwise run one worker per core
+    dev = os.getenv("DEV") == "1"
+    workers = 1 if dev else int(os.getenv("WORKERS", os.cpu_count() or 1))
+
     # Run FastAPI app with uvicorn
     # Import from src.main instead of root main
     uvicorn.run(
         "src.main:app",
         host="0.0.0.0",
         port=9999,
-        reload=True,
-        log_level="info"
+        reload=dev,
+        workers=workers,
+        # "auto" picks uvloop/httptools when installed (uvloop isn't available on Windows)
+        loop="auto",
+        http="auto",
+        proxy_headers=True,
+        log_level="info",
+        access_log=False
     )
@@ -1,5 +1,8 @@
+import hmac
 import os
 
+_ADMIN_KEY = (os.getenv("ADMIN_KEY") or "").encode()
+
 def verify_admin(request):
-    admin_key = request.headers.get("X-Admin-Key")
-    return admin_key and admin_key == os.getenv("ADMIN_KEY")
+    admin_key = request.headers.get("X-Admin-Key", "").encode()
+    return bool(_ADMIN_KEY) and hmac.compare_digest(admin_key, _ADMIN_KEY)
@@ -1,17 +1,102 @@
+"""
+Standalone per-IP limiter (Redis sorted set, or an in-process sliding window).
+
+Not wired into the FastAPI app: slowapi's `limiter` in src/main.py is the only
+limiter on the request path. Kept for embedding and tooling that need a plain
+`await is_rate_limited(ip)` check.
+"""
+import os
 import time
-from collections import defaultdict
+import uuid
+from collections import OrderedDict
+
+from src.config import RATE_LIMIT_STORAGE_URI
 
 REQUEST_LIMIT = int(os.getenv("RATE_LIMIT_PER_MINUTE", 15))
 WINDOW = 60
+MAX_TRACKED_IPS = int(os.getenv("RATE_LIMIT_MAX_TRACKED_IPS", 50000))
+SWEEP_EVERY = 1000
+
+# Rolling window in a single atomic round trip:
+# purge expired entries, count, insert current request, refresh TTL.
+# ARGV[4] is a unique member so hits with the same timestamp aren't collapsed
+_RATE_LIMIT_LUA = """
+local n = redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+local c = redis.call('ZCARD', KEYS[1])
+if c >= tonumber(ARGV[3]) then return 1 end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 0
+"""
+
+# Redis backend (shared across workers) when configured, otherwise in-process
+redis_client = None
+_script_sha = None
+
+if RATE_LIMIT_STORAGE_URI.startswith(("redis://", "rediss://")):
+    import redis.asyncio as aioredis
+    redis_client = aioredis.from_url(RATE_LIMIT_STORAGE_URI)
+
+# In-process sliding-window counter: ip -> [window_id, prev_count, curr_count]
+_counters = OrderedDict()
+_calls = 0
+
+
+async def _is_rate_limited_redis(ip, now):
+    global _script_sha
+    from redis.exceptions import NoScriptError
 
-_requests = defaultdict(list)
+    if _script_sha is None:
+        _script_sha = await redis_client.script_load(_RATE_LIMIT_LUA)
 
-def is_rate_limited(ip):
+    key = f"ratelimit:{ip}"
+    member = f"{now}:{uuid.uuid4().hex}"
+    try:
+        limited = await redis_client.evalsha(_script_sha, 1, key, now, WINDOW, REQUEST_LIMIT, member)
+    except NoScriptError:
+        # script cache was flushed (e.g. Redis restart) → reload once
+        _script_sha = await redis_client.script_load(_RATE_LIMIT_LUA)
+        limited = await redis_client.evalsha(_script_sha, 1, key, now, WINDOW, REQUEST_LIMIT, member)
+    return bool(int(limited))
+
+
+def _sweep_idle(window_id):
+    # entries are in least-recently-seen order, so stop at the first live one
+    while _counters:
+        ip, entry = next(iter(_counters.items()))
+        if entry[0] >= window_id - 1:
+            break
+        del _counters[ip]
+
+
+async def is_rate_limited(ip):
+    global _calls
     now = time.time()
-    _requests[ip] = [t for t in _requests[ip] if now - t < WINDOW]
+    if redis_client is not None:
+        return await _is_rate_limited_redis(ip, now)
+
+    window_id = int(now // WINDOW)
+    _calls += 1
+    if _calls % SWEEP_EVERY == 0:
+        _sweep_idle(window_id)
+
+    entry = _counters.get(ip)
+    if entry is None:
+        entry = _counters[ip] = [window_id, 0, 0]
+        while len(_counters) > MAX_TRACKED_IPS:
+            _counters.popitem(last=False)
+    else:
+        _counters.move_to_end(ip)
+
+    if entry[0] != window_id:
+        # shift current bucket into previous (or drop both if idle > 1 window)
+        entry[1] = entry[2] if entry[0] == window_id - 1 else 0
+        entry[2] = 0
+        entry[0] = window_id
 
-    if len(_requests[ip]) >= REQUEST_LIMIT:
+    weighted = entry[1] * (1 - (now % WINDOW) / WINDOW) + entry[2]
+    if weighted >= REQUEST_LIMIT:
         return True
 
-    _requests[ip].append(now)
+    entry[2] += 1
     return False
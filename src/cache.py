@@ -1,16 +1,57 @@
-import os
-import json
+import functools
 import hashlib
+import orjson
+import threading
+from collections import OrderedDict
 from time import time
-from typing import Optional
-from src.config import CACHE_DIR, CACHE_TTL
+from typing import Any, Optional, Tuple
+from diskcache import Cache
+from src.config import CACHE_DIR, CACHE_TTL, CACHE_SIZE_LIMIT
+from src.utils import dumps_json
 
-# Ensure cache directory exists
-os.makedirs(CACHE_DIR, exist_ok=True)
+try:
+    import xxhash
+except ImportError:  # optional, stdlib blake2b is the fallback
+    xxhash = None
 
-CACHE_VERSION = "v2"  # bump this if response format changes
+# SQLite-backed store with TTL and size-capped LRU eviction
+_disk = Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT, eviction_policy="least-recently-used")
 
+CACHE_VERSION = "v4"  # bump this if response format changes
 
+# Process-local hot tier in front of the disk cache: key -> (expiry, result, JSON bytes or None)
+MEM_CACHE_SIZE = 1024
+_MEM_CACHE: "OrderedDict[str, Tuple[float, Any, Optional[bytes]]]" = OrderedDict()
+_mem_lock = threading.Lock()
+
+
+def _mem_entry(key: str):
+    with _mem_lock:
+        entry = _MEM_CACHE.get(key)
+        if entry is None:
+            return None
+        if time() > entry[0]:
+            del _MEM_CACHE[key]
+            return None
+        _MEM_CACHE.move_to_end(key)
+        return entry
+
+
+def _mem_get(key: str):
+    entry = _mem_entry(key)
+    return entry[1] if entry is not None else None
+
+
+def _mem_put(key: str, expiry: float, result, raw: Optional[bytes] = None):
+    with _mem_lock:
+        _MEM_CACHE[key] = (expiry, result, raw)
+        _MEM_CACHE.move_to_end(key)
+        while len(_MEM_CACHE) > MEM_CACHE_SIZE:
+            _MEM_CACHE.popitem(last=False)
+
+
+# popular songs repeat the same arguments; skip re-encoding and re-hashing them
+@functools.lru_cache(maxsize=4096)
 def make_cache_key(
     artist: str,
     song: str,
@@ -24,90 +65,80 @@ def make_cache_key(
     Collision-safe, filesystem-safe cache key
     """
 
-    payload = {
-        "v": CACHE_VERSION,
-        "artist": (artist or "").strip().lower(),
-        "song": (song or "").strip().lower(),
-        "timestamps": bool(timestamps),
-        "sequence": sequence or "",
-        "fast": bool(fast),
-        "mood": bool(mood),
-        "metadata": bool(metadata),
-    }
+    # positional tuple → unambiguous encoding without dict building or key sorting
+    raw = orjson.dumps((
+        CACHE_VERSION,
+        (artist or "").strip().lower(),
+        (song or "").strip().lower(),
+        bool(timestamps),
+        sequence or "",
+        bool(fast),
+        bool(mood),
+        bool(metadata),
+    ))
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(raw)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
 
-    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
+def load_from_cache(key: str):
+    cached = _mem_get(key)
+    if cached is not None:
+        return cached
 
-def _get_cache_path(key: str) -> str:
-    return os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        result, expiry = _disk.get(key, expire_time=True)
+    except Exception:
+        return None
 
+    if result is not None and expiry is not None:
+        _mem_put(key, expiry, result)
+    return result
 
-def load_from_cache(key: str):
-    path = _get_cache_path(key)
-    if not os.path.exists(path):
-        return None
 
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if time() > data.get("expiry", 0):
-            try:
-                os.remove(path)
-            except Exception:
-                pass
+def load_from_cache_raw(key: str) -> Optional[bytes]:
+    """
+    Cached result as JSON bytes, for handlers that return it unchanged;
+    serialised once per hot-tier entry instead of on every hit
+    """
+    entry = _mem_entry(key)
+    if entry is None:
+        if load_from_cache(key) is None:
             return None
+        entry = _mem_entry(key)
+        if entry is None:
+            return None
+    if entry[2] is not None:
+        return entry[2]
 
-        return data.get("result")
-
-    except Exception:
-        # corrupted cache entry → delete
-        try:
-            os.remove(path)
-        except Exception:
-            pass
-        return None
+    raw = dumps_json(entry[1])
+    _mem_put(key, entry[0], entry[1], raw)
+    return raw
 
 
-def save_to_cache(key: str, result):
-    path = _get_cache_path(key)
+def save_to_cache(key: str, result, expire: int = CACHE_TTL):
+    _mem_put(key, time() + expire, result)
 
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "expiry": time() + CACHE_TTL,
-                    "result": result,
-                },
-                f,
-                ensure_ascii=False,
-                separators=(",", ":")
-            )
+        _disk.set(key, result, expire=expire)
     except Exception:
         pass
 
 
 def clear_cache():
-    removed, failed = [], []
-
-    for fname in os.listdir(CACHE_DIR):
-        path = os.path.join(CACHE_DIR, fname)
-        try:
-            os.remove(path)
-            removed.append(fname)
-        except Exception as e:
-            failed.append({"file": fname, "error": str(e)})
+    with _mem_lock:
+        _MEM_CACHE.clear()
 
-    return {"removed": removed, "failed": failed}
+    return {"removed": _disk.clear()}
 
 
 def cache_stats():
-    files = os.listdir(CACHE_DIR)
     return {
         "cache_dir": CACHE_DIR,
-        "cache_files": len(files),
-        "files": files,
+        "cache_entries": len(_disk),
+        "size_bytes": _disk.volume(),
+        "size_limit_bytes": CACHE_SIZE_LIMIT,
+        "memory_entries": len(_MEM_CACHE),
         "ttl_seconds": CACHE_TTL,
         "version": CACHE_VERSION
     }
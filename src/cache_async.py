@@ -0,0 +1,65 @@
+"""
+Async cache tier - shared Redis when REDIS_URL is set, otherwise the local
+disk cache run in a worker thread so handlers never block the event loop
+"""
+import asyncio
+import orjson
+from src.cache import load_from_cache, save_to_cache, clear_cache
+from src.config import REDIS_URL, CACHE_TTL
+from src.logger import get_logger
+from src.utils import dumps_json
+
+logger = get_logger("cache_async")
+
+KEY_PREFIX = "lyrica:cache:"
+
+_redis = None
+
+
+async def init():
+    """Create the Redis connection pool (call this on app startup)"""
+    global _redis
+    if not REDIS_URL or _redis is not None:
+        return
+    from redis.asyncio import ConnectionPool, Redis
+    _redis = Redis.from_pool(ConnectionPool.from_url(REDIS_URL, max_connections=64))
+    logger.info("Redis response cache enabled")
+
+
+async def close():
+    """Close the Redis connection pool (call this on app shutdown)"""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def aget(key: str):
+    if _redis is None:
+        return await asyncio.to_thread(load_from_cache, key)
+
+    try:
+        raw = await _redis.get(KEY_PREFIX + key)
+    except Exception as e:
+        # an unreachable cache is a miss, not a failed request
+        logger.warning(f"Redis get failed: {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def aset(key: str, value, ex: int = CACHE_TTL):
+    if _redis is None:
+        await asyncio.to_thread(save_to_cache, key, value, ex)
+        return
+
+    await _redis.set(KEY_PREFIX + key, dumps_json(value), ex=ex)
+
+
+async def aclear():
+    if _redis is None:
+        return await asyncio.to_thread(clear_cache)
+
+    removed = 0
+    async for key in _redis.scan_iter(match=KEY_PREFIX + "*", count=500):
+        removed += await _redis.unlink(key)
+    return {"removed": removed}
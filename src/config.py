@@ -10,6 +10,10 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Caching (Render safe)
 CACHE_DIR = os.getenv("CACHE_DIR") or os.path.join(BASE_DIR, "cache_data")
 CACHE_TTL = int(os.getenv("CACHE_TTL", 300))  # seconds
+CACHE_SIZE_LIMIT = int(os.getenv("CACHE_SIZE_LIMIT", 256 * 1024 * 1024))  # bytes
+
+# Shared response cache (optional). Example: redis://:password@redis-host:6379/1
+REDIS_URL = os.getenv("REDIS_URL", "")
 
 # Admin security key (MUST be set on Render)
 ADMIN_KEY = os.getenv("ADMIN_KEY")
@@ -25,6 +29,10 @@ YOUTUBE_COOKIE = os.getenv("YOUTUBE_COOKIE", "")
 # lrclib
 LRCLIB_API_URL = os.getenv("LRCLIB_API_URL", "https://lrclib.net/api/get")
 
+# Take the client IP from the last X-Forwarded-For hop, i.e. the one appended by our own
+# reverse proxy (enable only when deployed behind exactly one proxy, such as Render's)
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+
 # Rate limiting storage backend (recommended: Redis for production)
 # Example: redis://:password@redis-host:6379/0
 RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
@@ -1,9 +1,13 @@
 import asyncio
-from datetime import datetime, timezone
+import math
+try:
+    from asyncio import timeout as async_timeout  # Python 3.11+
+except ImportError:
+    from async_timeout import timeout as async_timeout
 from src.logger import get_logger
-from src.utils import maybe_await
+from src.utils import maybe_await, utcnow_str
 from src.sources import ALL_FETCHERS
-from src.validator import validate_and_filter_results
+from src.validator import validate_and_filter_results, normalize_query
 import logging
 
 logger = get_logger("fetch_controller")
@@ -21,16 +25,75 @@ FETCHER_MAP = {
 DEFAULT_SYNCED_SEQUENCE = [2, 3, 4]
 DEFAULT_PLAIN_SEQUENCE = [1, 2, 3, 4, 5, 6]
 
+# (api_name, fetcher) indexed by numeric id; index 0 is unused
+_FETCHERS_BY_ID = (
+    None,
+    ("Genius", ALL_FETCHERS.get("genius")),
+    ("LRCLIB", ALL_FETCHERS.get("lrclib")),
+    ("SimpMusic", ALL_FETCHERS.get("simpmusic")),
+    ("YouTube Music", ALL_FETCHERS.get("youtube")),
+    ("Lyrics.ovh", ALL_FETCHERS.get("lyricsovh")),
+    ("ChartLyrics", ALL_FETCHERS.get("chartlyrics")),
+)
+
 # Fast mode uses only the fastest fetchers
 FAST_MODE_SEQUENCE = [2, 3]  # LRCLIB and SimpMusic
 
+# Parallel mode launches fetchers one at a time, HEDGE_DELAY_MS apart,
+# tiered by hit rate and, within a tier, by latency of successful fetches
+# (both exponentially weighted moving averages)
+HEDGE_DELAY_MS = 150
+HIT_RATE_TIERS = 4
+_EWMA_ALPHA = 0.2
+# Priors for unseen fetchers: top tier and a typical upstream round trip, so the requested
+# order decides until there's history and a fetcher that has proved fast moves ahead of them
+_HIT_RATE_PRIOR = 1.0
+_LATENCY_PRIOR = 1.0  # seconds
+_latency_ewma: dict[int, float] = {}
+_hit_rate_ewma: dict[int, float] = {}
+
+def _ewma(table: dict, fetcher_id: int, value: float, prior: float):
+    # the first sample is blended into the prior, so one miss can't drop a fetcher straight to the bottom
+    table[fetcher_id] = _EWMA_ALPHA * value + (1 - _EWMA_ALPHA) * table.get(fetcher_id, prior)
+
+def _rank(candidate) -> tuple:
+    fetcher_id = candidate[0]
+    # ceil: tier 4 is (0.75, 1.0], so one miss among hits doesn't cost a fetcher its tier
+    return (-math.ceil(_hit_rate_ewma.get(fetcher_id, _HIT_RATE_PRIOR) * HIT_RATE_TIERS),
+            _latency_ewma.get(fetcher_id, _LATENCY_PRIOR))
+
+def _parse_seq(sequence: str) -> list[int] | None:
+    """Parse "2,3,1" into fetcher ids in one pass; None if malformed, out of range or repeated"""
+    seen = 0
+    out = []
+    for part in sequence.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdecimal():
+            return None
+        v = int(part)
+        if v < 1 or v > 6:
+            return None
+        bit = 1 << v
+        if seen & bit:
+            return None
+        seen |= bit
+        out.append(v)
+    return out or None
+
+# Strong references to reaper tasks so they aren't garbage-collected mid-run
+_background_tasks = set()
+
+async def _drain(tasks):
+    """Wait for cancelled tasks to unwind so their connections get closed"""
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 async def fetch_with_timeout(api_name: str, fetcher, artist_name: str, song_title: str, timestamps: bool, timeout: int = 10):
     """Fetch with timeout protection"""
     try:
-        result = await asyncio.wait_for(
-            maybe_await(fetcher.fetch, artist_name, song_title, timestamps=timestamps),
-            timeout=timeout
-        )
+        async with async_timeout(timeout):
+            result = await maybe_await(fetcher.fetch, artist_name, song_title, timestamps=timestamps)
         # Validate result has actual lyrics
         if result and (not timestamps or result.get("hasTimestamps") or result.get("timed_lyrics") or result.get("timestamped")):
             return {"api": api_name, "result": result, "success": True}
@@ -41,62 +104,88 @@ async def fetch_with_timeout(api_name: str, fetcher, artist_name: str, song_titl
         logger.error(f"{api_name} error: {str(e)}")
         return {"api": api_name, "success": False, "reason": str(e)}
 
-async def fetch_lyrics_parallel(artist_name: str, song_title: str, timestamps: bool, fetcher_ids: list):
-    """Fetch from multiple sources in parallel, return first success"""
-    all_fetchers = {
-        1: ("Genius", ALL_FETCHERS.get("genius")),
-        2: ("LRCLIB", ALL_FETCHERS.get("lrclib")),
-        3: ("SimpMusic", ALL_FETCHERS.get("simpmusic")),
-        4: ("YouTube Music", ALL_FETCHERS.get("youtube")),
-        5: ("Lyrics.ovh", ALL_FETCHERS.get("lyricsovh")),
-        6: ("ChartLyrics", ALL_FETCHERS.get("chartlyrics")),
-    }
-    
-    # Create tasks for all fetchers
-    tasks = []
-    
+async def fetch_lyrics_parallel(artist_name: str, song_title: str, timestamps: bool, fetcher_ids: list, accept=None):
+    """Fetch from multiple sources with staggered (hedged) launches, return first success
+
+    accept, if given, is called with each successful attempt; a False return
+    turns it into a miss so the race carries on with the remaining fetchers.
+    """
+    candidates = []
     for fetcher_id in fetcher_ids:
-        if fetcher_id not in all_fetchers:
+        if not 1 <= fetcher_id <= 6:
             continue
-        api_name, fetcher = all_fetchers[fetcher_id]
+        api_name, fetcher = _FETCHERS_BY_ID[fetcher_id]
         if not fetcher:
             continue
+        candidates.append((fetcher_id, api_name, fetcher))
+    
+    if not candidates:
+        return None, []
+    
+    # Stable sort: ties keep the requested order (e.g. Genius first for plain lyrics)
+    candidates.sort(key=_rank)
+    
+    loop = asyncio.get_running_loop()
+    completed = asyncio.Queue()
+    started = {}
+    tasks = []
+    
+    def launch():
+        fetcher_id, api_name, fetcher = candidates[len(tasks)]
         # Create task explicitly to avoid coroutine issue
         task = asyncio.create_task(fetch_with_timeout(api_name, fetcher, artist_name, song_title, timestamps))
+        started[task] = (fetcher_id, loop.time())
+        task.add_done_callback(completed.put_nowait)
         tasks.append(task)
     
-    # Race: return first successful result
-    if not tasks:
-        return None, []
-    
+    launch()
     attempts = []
-    pending = set(tasks)
     
-    while pending:
-        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
-        
-        for task in done:
-            result = await task
+    try:
+        while len(attempts) < len(candidates):
+            if len(tasks) < len(candidates):
+                # Give the in-flight fetchers a head start before hedging with the next one
+                try:
+                    async with async_timeout(HEDGE_DELAY_MS / 1000):
+                        task = await completed.get()
+                except asyncio.TimeoutError:
+                    launch()
+                    continue
+            else:
+                task = await completed.get()
+            
+            result = task.result()
+            if result["success"] and accept is not None and not accept(result):
+                result = {"api": result["api"], "success": False, "reason": "validation_failed"}
             attempts.append(result)
+            fetcher_id, t0 = started[task]
+            # Only successes feed latency - a fetcher that fails fast must not climb the order
+            _ewma(_hit_rate_ewma, fetcher_id, 1.0 if result["success"] else 0.0, _HIT_RATE_PRIOR)
             if result["success"]:
-                # Cancel remaining tasks
-                for t in pending:
-                    t.cancel()
+                _ewma(_latency_ewma, fetcher_id, loop.time() - t0, _LATENCY_PRIOR)
                 return result["result"], attempts
-    
-    return None, attempts
+            
+            # A miss means the next fetcher shouldn't wait out the hedge delay
+            if len(tasks) < len(candidates):
+                launch()
+        
+        return None, attempts
+    finally:
+        # Cancel whatever is still running - on success, or if the caller itself
+        # was cancelled mid-race - and reap it off the response path. Cancelled
+        # fetchers never finished, so they feed neither hit rate nor latency.
+        pending = [t for t in tasks if not t.done()]
+        if pending:
+            for t in pending:
+                t.cancel()
+            reaper = asyncio.create_task(_drain(pending))
+            _background_tasks.add(reaper)
+            reaper.add_done_callback(_background_tasks.discard)
 
 async def fetch_lyrics_controller(artist_name: str, song_title: str, timestamps: bool=False, pass_param: bool=False, sequence: str|None=None, fast_mode: bool=False):
     """Main controller - handles normal and fast parallel modes"""
     
-    all_fetchers = {
-        1: ("Genius", ALL_FETCHERS.get("genius")),
-        2: ("LRCLIB", ALL_FETCHERS.get("lrclib")),
-        3: ("SimpMusic", ALL_FETCHERS.get("simpmusic")),
-        4: ("YouTube Music", ALL_FETCHERS.get("youtube")),
-        5: ("Lyrics.ovh", ALL_FETCHERS.get("lyricsovh")),
-        6: ("ChartLyrics", ALL_FETCHERS.get("chartlyrics")),
-    }
+    query_tokens = normalize_query(artist_name, song_title)
     
     # Determine fetcher sequence
     if fast_mode:
@@ -104,26 +193,17 @@ async def fetch_lyrics_controller(artist_name: str, song_title: str, timestamps:
         fetcher_ids = FAST_MODE_SEQUENCE
         logger.info(f"Fast mode enabled for {artist_name} - {song_title}")
     elif pass_param and sequence:
-        try:
-            fetcher_ids = [int(x) for x in sequence.split(",") if x.strip() != ""]
-            if not fetcher_ids or not all(1 <= x <= 6 for x in fetcher_ids) or len(fetcher_ids) > 6 or len(fetcher_ids) != len(set(fetcher_ids)):
-                return {
-                    "status": "error",
-                    "error": {
-                        "message": "Invalid sequence: must be unique numbers between 1 and 6",
-                        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                }
-        except ValueError:
+        fetcher_ids = _parse_seq(sequence)
+        if fetcher_ids is None:
             return {
                 "status": "error",
                 "error": {
-                    "message": "Invalid sequence format: must be comma-separated integers",
-                    "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                    "message": "Invalid sequence: must be comma-separated unique numbers between 1 and 6",
+                    "timestamp": utcnow_str()
                 }
             }
     else:
-        # Normal mode: sequential fetch with defaults
+        # Normal mode: default sequence, raced below
         fetcher_ids = DEFAULT_SYNCED_SEQUENCE if timestamps else DEFAULT_PLAIN_SEQUENCE
     
     # If fast mode or custom sequence with multiple fetchers, use parallel
@@ -132,7 +212,7 @@ async def fetch_lyrics_controller(artist_name: str, song_title: str, timestamps:
         
         # Validate result matches requested artist/song
         if result:
-            validation = validate_and_filter_results(artist_name, song_title, attempts, threshold=0.75)
+            validation = validate_and_filter_results(artist_name, song_title, attempts, threshold=0.75, precomputed=query_tokens)
             
             if validation.get("has_valid_match"):
                 # Return the first valid result with validation info (no duplicate data)
@@ -156,7 +236,7 @@ async def fetch_lyrics_controller(artist_name: str, song_title: str, timestamps:
                     "status": "error",
                     "error": {
                         "message": f"Found results but none matched '{song_title}' by '{artist_name}' (possible wrong song returned by API)",
-                        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                        "timestamp": utcnow_str()
                     }
                 }
         else:
@@ -164,47 +244,27 @@ async def fetch_lyrics_controller(artist_name: str, song_title: str, timestamps:
                 "status": "error",
                 "error": {
                     "message": f"No lyrics found for '{song_title}' by '{artist_name}'",
-                    "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                    "timestamp": utcnow_str()
                 }
             }
     
-    # Normal sequential mode
-    attempts = []
-    for fetcher_id in fetcher_ids:
-        api_name, fetcher = all_fetchers[fetcher_id]
-        if not fetcher:
-            attempts.append({"api": api_name, "status": "not_configured"})
-            continue
-        
-        try:
-            result = await maybe_await(fetcher.fetch, artist_name, song_title, timestamps=timestamps)
-            if result and (not timestamps or result.get("hasTimestamps") or result.get("timed_lyrics") or result.get("timestamped")):
-                # Validate result before returning
-                validation = validate_and_filter_results(artist_name, song_title, [{"api": api_name, "result": result}], threshold=0.75)
-                
-                if validation.get("has_valid_match"):
-                    valid_result = validation.get("valid_results", [{}])[0]
-                    return {
-                        "status": "success",
-                        "data": valid_result.get("result", result)
-                    }
-                else:
-                    # This result didn't match, continue to next fetcher
-                    attempts.append({
-                        "api": api_name,
-                        "status": "validation_failed"
-                    })
-                    continue
-            
-            attempts.append({"api": api_name, "status": "no_results"})
-        except Exception as e:
-            logger.error(f"{api_name} error: {str(e)}")
-            attempts.append({"api": api_name, "status": "error", "message": str(e)})
+    # Normal mode: race the whole sequence with hedged launches instead of
+    # waiting for each fetcher to miss in turn; a result that fails
+    # validation counts as a miss, so the next fetcher still gets its chance
+    def _accept(attempt):
+        return validate_and_filter_results(artist_name, song_title, [attempt], threshold=0.75, precomputed=query_tokens)["has_valid_match"]
+    
+    result, _ = await fetch_lyrics_parallel(artist_name, song_title, timestamps, fetcher_ids, accept=_accept)
+    if result:
+        return {
+            "status": "success",
+            "data": result
+        }
     
     return {
         "status": "error",
         "error": {
             "message": f"No lyrics found for '{song_title}' by '{artist_name}'",
-            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": utcnow_str()
         }
     }
\ No newline at end of file
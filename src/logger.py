@@ -1,13 +1,16 @@
+import functools
 import logging
 from src.config import LOG_LEVEL
 
+_LEVEL = getattr(logging, LOG_LEVEL.upper(), logging.INFO)
+_FORMATTER = logging.Formatter("[%(levelname)s] %(asctime)s - %(message)s")
+
+@functools.cache
 def get_logger(name="Lyrica"):
     logger = logging.getLogger(name)
     if not logger.handlers:
-        level = getattr(logging, LOG_LEVEL.upper(), logging.INFO)
-        logger.setLevel(level)
+        logger.setLevel(_LEVEL)
         handler = logging.StreamHandler()
-        formatter = logging.Formatter("[%(levelname)s] %(asctime)s - %(message)s")
-        handler.setFormatter(formatter)
+        handler.setFormatter(_FORMATTER)
         logger.addHandler(handler)
     return logger
@@ -1,40 +1,99 @@
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
 from slowapi import Limiter
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+import anyio
 import asyncio
+import hashlib
+import hmac
 import os
 import logging
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional, gzip is the fallback
+    BrotliMiddleware = None
+
 from src.logger import get_logger
-from src.cache import clear_cache, cache_stats, make_cache_key, load_from_cache, save_to_cache
-from src.config import ADMIN_KEY
+from src.utils import dumps_json, utcnow_iso
+from src.cache import cache_stats, make_cache_key
+from src import cache_async
+from src.config import ADMIN_KEY, CACHE_TTL, TRUST_FORWARDED_FOR, RATE_LIMIT_STORAGE_URI, REDIS_URL
 from src import __version__
 from src.fetch_controller import fetch_lyrics_controller
 from src.sentiment_analyzer import analyze_sentiment, analyze_word_frequency, extract_lyrics_text
+from src import metadata_extractor
 from src.metadata_extractor import enhance_lyrics_with_metadata, get_metadata_only
 from src.sources.jiosaavan_fetcher import search_jiosaavn, get_jiosaavn_stream
 from src.trending_analytics import TrendingAnalyticsEngine, Country
 from src.sources.fetcher_manager import initialize_fetchers, cleanup_fetchers
 
+# App lifecycle
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up long-lived async resources on startup and release them on shutdown"""
+    logger.info("Lyrica API starting up...")
+    # trending calls run in the threadpool; default of 40 threads is too few
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 80
+    await cache_async.init()
+    app.state.flusher = asyncio.create_task(_analytics_flusher())
+    success = await initialize_fetchers()
+    if not success:
+        logger.warning("Some fetchers failed to initialize")
+    logger.info("Lyrica API ready!")
+
+    yield
+
+    logger.info("Lyrica API shutting down...")
+    # let the flusher record its current batch and everything queued behind it, off the loop
+    await _analytics_queue.put(_ANALYTICS_STOP)
+    await app.state.flusher
+    await cleanup_fetchers()
+    await metadata_extractor.close()
+    await cache_async.close()
+    logger.info("Lyrica API shutdown complete")
+
+
 # Initialize
 logger = get_logger("Lyrica")
-app = FastAPI(title="Lyrica", version=__version__)
+app = FastAPI(title="Lyrica", version=__version__, default_response_class=ORJSONResponse, lifespan=lifespan)
 trending_engine = TrendingAnalyticsEngine(cache_ttl_hours=24)
 
-# Rate limiting
-limiter = Limiter(key_func=get_remote_address, default_limits=["15/minute"])
+# Rate limiting (counters live in Redis when configured so all workers share them)
+if RATE_LIMIT_STORAGE_URI == "memory://" and REDIS_URL:
+    RATE_LIMIT_STORAGE_URI = REDIS_URL
+def _rl_key(request: Request) -> str:
+    # set once by the client-IP middleware; the fallback covers requests it didn't see
+    return getattr(request.state, "client_ip", None) or (request.client.host if request.client else "0.0.0.0")
+
+limiter = Limiter(
+    key_func=_rl_key,
+    default_limits=["15/minute"],
+    storage_uri=RATE_LIMIT_STORAGE_URI
+)
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, lambda request, exc: JSONResponse(
+app.add_exception_handler(RateLimitExceeded, lambda request, exc: ORJSONResponse(
     status_code=429,
     content={"status": "error", "error": {"message": "Rate limit exceeded. Please wait 35 seconds before retrying."}},
     headers={"Retry-After": "35"}
 ))
 
+# Client IP, resolved once per request (the socket peer is the proxy when deployed behind one)
+@app.middleware("http")
+async def _client_ip(request: Request, call_next):
+    xff = request.headers.get("x-forwarded-for") if TRUST_FORWARDED_FOR else None
+    if xff:
+        # earlier hops are whatever the client sent; only the proxy's own append is trustworthy
+        request.state.client_ip = xff.rsplit(",", 1)[-1].strip()
+    else:
+        request.state.client_ip = request.client.host if request.client else "unknown"
+    return await call_next(request)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -44,205 +103,251 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression (lyrics/home JSON is repetitive text; skip tiny bodies)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Static files
 if os.path.exists("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Admin helper
-def verify_admin_key(request: Request) -> bool:
-    key = request.query_params.get("key") or request.headers.get("X-ADMIN-KEY")
-    return key == ADMIN_KEY
+# Country lookup tables, built once
+_COUNTRY_BY_NAME = {c.name: c for c in Country}
+_VALID_COUNTRIES = tuple(c.value for c in Country)
 
-
-# App lifecycle events
-@app.on_event("startup")
-async def startup_event():
-    """Initialize async resources on app startup"""
-    logger.info("Lyrica API starting up...")
-    success = await initialize_fetchers()
-    if not success:
-        logger.warning("Some fetchers failed to initialize")
-    logger.info("Lyrica API ready!")
+# User queries are recorded off the request path in batches
+ANALYTICS_BATCH_SIZE = 256
+ANALYTICS_FLUSH_INTERVAL = 0.1  # seconds
+_analytics_queue = asyncio.Queue(maxsize=10000)
+# Queued at shutdown; the flusher records everything ahead of it, then exits
+_ANALYTICS_STOP = None
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up async resources on app shutdown"""
-    logger.info("Lyrica API shutting down...")
-    await cleanup_fetchers()
-    logger.info("Lyrica API shutdown complete")
+def _drain_analytics_queue(batch: list) -> list:
+    while len(batch) < ANALYTICS_BATCH_SIZE and batch[-1] is not _ANALYTICS_STOP:
+        try:
+            batch.append(_analytics_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
+async def _analytics_flusher():
+    while True:
+        batch = _drain_analytics_queue([await _analytics_queue.get()])
+        stop = batch[-1] is _ANALYTICS_STOP
+        if stop:
+            batch.pop()
+        if batch:
+            try:
+                # the engine's query lock is shared with threadpool readers, so wait for it off the loop
+                await run_in_threadpool(trending_engine.record_user_queries_batch, batch)
+            except Exception as e:
+                logger.warning(f"Failed to record user queries: {str(e)}")
+        if stop:
+            return
+        await asyncio.sleep(ANALYTICS_FLUSH_INTERVAL)
+
+# Caps concurrent upstream chart fetches across all /trending/ requests
+_trending_fanout = asyncio.Semaphore(10)
+
+# Conditional GET helpers
+CONDITIONAL_CACHE_CONTROL = "public, max-age=3600"
+# query analytics move with live traffic, so only cache them briefly
+ANALYTICS_CACHE_CONTROL = "public, max-age=60"
+
+def make_etag(body: bytes, weak: bool = False) -> str:
+    """ETag of a response body; weak when the body also carries a per-response timestamp"""
+    tag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return "W/" + tag if weak else tag
+
+def not_modified(request: Request, etag: str, cache_control: str = CONDITIONAL_CACHE_CONTROL):
+    """304 response if the client already holds this ETag (weak comparison), else None"""
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return None
+    opaque = etag.removeprefix("W/")
+    if inm.strip() == "*" or opaque in (t.strip().removeprefix("W/") for t in inm.split(",")):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+def error_response(status_code: int, message: str, **extras) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail={"status": "error", "error": {"message": message, "timestamp": utcnow_iso(), **extras}}
+    )
 
+# Admin helper
+_ADMIN_KEY_BYTES = (ADMIN_KEY or "").encode()
 
-@app.get("/")
-@limiter.limit("15/minute")
-async def home(request: Request):
-    """Main API documentation endpoint"""
-    return {
-        "api": "Lyrica",
-        "version": __version__,
-        "status": "active",
-        "description": "A comprehensive lyrics API with mood analysis, metadata extraction, and trending insights",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "endpoints": {
-            "lyrics": {
-                "url": "/lyrics/",
-                "method": "GET",
-                "description": "Fetch lyrics for a song",
-                "examples": [
-                    "/lyrics/?artist=The Beatles&song=Imagine",
-                    "/lyrics/?artist=The Beatles&song=Imagine&timestamps=true",
-                    "/lyrics/?artist=The Beatles&song=Imagine&mood=true",
-                    "/lyrics/?artist=The Beatles&song=Imagine&metadata=true",
-                    "/lyrics/?artist=The Beatles&song=Imagine&fast=true&timestamps=true&mood=true&metadata=true"
-                ]
-            },
-            "metadata_only": {
-                "url": "/metadata/",
-                "method": "GET",
-                "description": "Get song metadata without lyrics",
-                "examples": ["/metadata/?artist=The Beatles&song=Imagine"]
-            },
-            "trending": {
-                "url": "/trending/",
-                "method": "GET",
-                "description": "Get trending songs by country",
-                "examples": [
-                    "/trending/?country=US&limit=20",
-                    "/trending/?country=IN",
-                    "/trending/?countries=US,GB,IN&limit=10"
-                ]
-            },
-            "top_queries": {
-                "url": "/analytics/top-queries/",
-                "method": "GET",
-                "description": "Get top user queries globally or by country",
-                "examples": [
-                    "/analytics/top-queries/?limit=20",
-                    "/analytics/top-queries/?country=US&limit=10",
-                    "/analytics/top-queries/?country=US&days=7&limit=15"
-                ]
-            },
-            "trending_by_country": {
-                "url": "/analytics/trending-by-country/",
-                "method": "GET",
-                "description": "Get top queries for each country",
-                "examples": ["/analytics/trending-by-country/?limit=10"]
-            },
-            "trending_vs_queries": {
-                "url": "/analytics/trending-vs-queries/",
-                "method": "GET",
-                "description": "Compare trending songs with top user queries",
-                "examples": ["/analytics/trending-vs-queries/?country=US&limit=10"]
-            },
-            "trending_intersection": {
-                "url": "/analytics/trending-intersection/",
-                "method": "GET",
-                "description": "Find queries that match trending songs",
-                "examples": ["/analytics/trending-intersection/?country=US&limit=10"]
-            },
-            "jiosaavn_search": {
-                "url": "/api/jiosaavn/search",
-                "method": "GET",
-                "description": "Search for songs on JioSaavn",
-                "examples": ["/api/jiosaavn/search?q=Imagine"]
-            },
-            "jiosaavn_play": {
-                "url": "/api/jiosaavn/play",
-                "method": "GET",
-                "description": "Get playable stream URL from JioSaavn",
-                "examples": ["/api/jiosaavn/play?songLink=<song_link>"]
-            },
-            "cache_stats": {
-                "url": "/cache/stats",
-                "method": "GET",
-                "description": "Get cache statistics"
-            },
-            "music_app": {
-                "url": "/app",
-                "method": "GET",
-                "description": "Access the web-based music application"
-            }
+def verify_admin_key(request: Request) -> bool:
+    key = request.query_params.get("key") or request.headers.get("X-ADMIN-KEY") or ""
+    return bool(_ADMIN_KEY_BYTES) and hmac.compare_digest(key.encode(), _ADMIN_KEY_BYTES)
+
+
+# home() response is fully static, so it is serialised once at import
+_HOME_PAYLOAD = {
+    "api": "Lyrica",
+    "version": __version__,
+    "status": "active",
+    "description": "A comprehensive lyrics API with mood analysis, metadata extraction, and trending insights",
+    "endpoints": {
+        "lyrics": {
+            "url": "/lyrics/",
+            "method": "GET",
+            "description": "Fetch lyrics for a song",
+            "examples": [
+                "/lyrics/?artist=The Beatles&song=Imagine",
+                "/lyrics/?artist=The Beatles&song=Imagine&timestamps=true",
+                "/lyrics/?artist=The Beatles&song=Imagine&mood=true",
+                "/lyrics/?artist=The Beatles&song=Imagine&metadata=true",
+                "/lyrics/?artist=The Beatles&song=Imagine&fast=true&timestamps=true&mood=true&metadata=true"
+            ]
+        },
+        "metadata_only": {
+            "url": "/metadata/",
+            "method": "GET",
+            "description": "Get song metadata without lyrics",
+            "examples": ["/metadata/?artist=The Beatles&song=Imagine"]
+        },
+        "trending": {
+            "url": "/trending/",
+            "method": "GET",
+            "description": "Get trending songs by country",
+            "examples": [
+                "/trending/?country=US&limit=20",
+                "/trending/?country=IN",
+                "/trending/?countries=US,GB,IN&limit=10"
+            ]
+        },
+        "top_queries": {
+            "url": "/analytics/top-queries/",
+            "method": "GET",
+            "description": "Get top user queries globally or by country",
+            "examples": [
+                "/analytics/top-queries/?limit=20",
+                "/analytics/top-queries/?country=US&limit=10",
+                "/analytics/top-queries/?country=US&days=7&limit=15"
+            ]
+        },
+        "trending_by_country": {
+            "url": "/analytics/trending-by-country/",
+            "method": "GET",
+            "description": "Get top queries for each country",
+            "examples": ["/analytics/trending-by-country/?limit=10"]
+        },
+        "trending_vs_queries": {
+            "url": "/analytics/trending-vs-queries/",
+            "method": "GET",
+            "description": "Compare trending songs with top user queries",
+            "examples": ["/analytics/trending-vs-queries/?country=US&limit=10"]
+        },
+        "trending_intersection": {
+            "url": "/analytics/trending-intersection/",
+            "method": "GET",
+            "description": "Find queries that match trending songs",
+            "examples": ["/analytics/trending-intersection/?country=US&limit=10"]
+        },
+        "jiosaavn_search": {
+            "url": "/api/jiosaavn/search",
+            "method": "GET",
+            "description": "Search for songs on JioSaavn",
+            "examples": ["/api/jiosaavn/search?q=Imagine"]
+        },
+        "jiosaavn_play": {
+            "url": "/api/jiosaavn/play",
+            "method": "GET",
+            "description": "Get playable stream URL from JioSaavn",
+            "examples": ["/api/jiosaavn/play?songLink=<song_link>"]
         },
-        "parameters": {
-            "artist": {"type": "string", "required": True, "description": "Artist name"},
-            "song": {"type": "string", "required": True, "description": "Song title"},
-            "country": {"type": "string", "required": False, "description": "Country code (US, GB, IN, BR, JP, DE, FR, CA, AU, MX)"},
-            "countries": {"type": "string", "required": False, "description": "Comma-separated country codes"},
-            "limit": {"type": "integer", "required": False, "default": 20, "description": "Number of results"},
-            "days": {"type": "integer", "required": False, "description": "Time window in days"},
-            "timestamps": {"type": "boolean", "required": False, "default": False, "description": "Include synchronized timestamps"},
-            "mood": {"type": "boolean", "required": False, "default": False, "description": "Analyze sentiment and top words"},
-            "metadata": {"type": "boolean", "required": False, "default": False, "description": "Include song metadata"},
-            "fast": {"type": "boolean", "required": False, "default": False, "description": "Use parallel fetching"}
+        "cache_stats": {
+            "url": "/cache/stats",
+            "method": "GET",
+            "description": "Get cache statistics"
         },
-        "fetchers": {
-            "1": "Genius",
-            "2": "LRCLIB",
-            "3": "SimpMusic",
-            "4": "YouTube Music",
-            "5": "Lyrics.ovh",
-            "6": "ChartLyrics"
+        "music_app": {
+            "url": "/app",
+            "method": "GET",
+            "description": "Access the web-based music application"
         }
+    },
+    "parameters": {
+        "artist": {"type": "string", "required": True, "description": "Artist name"},
+        "song": {"type": "string", "required": True, "description": "Song title"},
+        "country": {"type": "string", "required": False, "description": "Country code (US, GB, IN, BR, JP, DE, FR, CA, AU, MX)"},
+        "countries": {"type": "string", "required": False, "description": "Comma-separated country codes"},
+        "limit": {"type": "integer", "required": False, "default": 20, "description": "Number of results"},
+        "days": {"type": "integer", "required": False, "description": "Time window in days"},
+        "timestamps": {"type": "boolean", "required": False, "default": False, "description": "Include synchronized timestamps"},
+        "mood": {"type": "boolean", "required": False, "default": False, "description": "Analyze sentiment and top words"},
+        "metadata": {"type": "boolean", "required": False, "default": False, "description": "Include song metadata"},
+        "fast": {"type": "boolean", "required": False, "default": False, "description": "Use parallel fetching"}
+    },
+    "fetchers": {
+        "1": "Genius",
+        "2": "LRCLIB",
+        "3": "SimpMusic",
+        "4": "YouTube Music",
+        "5": "Lyrics.ovh",
+        "6": "ChartLyrics"
     }
+}
+_HOME_BYTES = dumps_json(_HOME_PAYLOAD)
+_HOME_ETAG = make_etag(_HOME_BYTES)
+_HOME_CACHE_CONTROL = "public, max-age=86400"
+_HOME_HEADERS = {"ETag": _HOME_ETAG, "Cache-Control": _HOME_CACHE_CONTROL}
 
 
-@app.get("/lyrics/")
+@app.get("/")
 @limiter.limit("15/minute")
-async def lyrics(
-    request: Request,
-    artist: str = None,
-    song: str = None,
-    country: str = "US",
-    timestamps: bool = False,
-    timestamp: bool = False,
-    pass_param: bool = False,
-    sequence: str = None,
-    fast: bool = False,
-    mood: bool = False,
-    metadata: bool = False,
-):
-    """Fetch lyrics with optional mood analysis and metadata"""
-    artist = (artist or "").strip()
-    song = (song or "").strip()
-    country = country.strip().upper()
-    timestamps = timestamps or timestamp
-    
-    if not artist or not song:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": {"message": "Artist and song name are required", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+async def home(request: Request):
+    """Main API documentation endpoint"""
+    cached_response = not_modified(request, _HOME_ETAG, _HOME_CACHE_CONTROL)
+    if cached_response:
+        return cached_response
+    return Response(content=_HOME_BYTES, media_type="application/json", headers=_HOME_HEADERS)
+
+
+# Large (timestamped + metadata) lyrics bodies are serialised once and sent in chunks
+STREAM_THRESHOLD = 64 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def lyrics_response(result: dict, request: Request = None):
+    """Lyrics JSON; given the request, the body's ETag is attached and may answer with a 304"""
+    body = dumps_json(result)
+    headers = None
+    if request is not None:
+        etag = make_etag(body)
+        cached_response = not_modified(request, etag)
+        if cached_response:
+            return cached_response
+        headers = {"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    if len(body) < STREAM_THRESHOLD:
+        return Response(content=body, media_type="application/json", headers=headers)
+    chunks = (body[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(body), STREAM_CHUNK_SIZE))
+    return StreamingResponse(
+        chunks,
+        media_type="application/json",
+        headers={**(headers or {}), "Content-Length": str(len(body))}
+    )
 
-    if pass_param and not sequence:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": {"message": "Sequence parameter is required when pass=true", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
 
-    logger.info(f"Lyrics request: {artist} - {song} (fast={fast}, mood={mood}, metadata={metadata})")
+# Cache misses in flight, keyed by cache key, so concurrent identical requests share one fetch
+_inflight = {}
 
-    try:
-        trending_engine.record_user_query(
-            user_id=request.client.host,
-            query=f"{artist} - {song}",
-            country=country
-        )
-    except Exception as e:
-        logger.warning(f"Failed to record user query: {str(e)}")
 
-    # Check cache
-    cache_key = make_cache_key(artist, song, timestamps, sequence, fast, mood, metadata)
-    cached = load_from_cache(cache_key)
-    if cached:
-        logger.info(f"Cache hit for {artist} - {song}")
-        return cached
+def is_cacheable(result: dict) -> bool:
+    if result.get("status") != "success":
+        return False
+    data = result.get("data", {})
+    return bool(data.get("lyrics") or data.get("plain_lyrics") or data.get("lyrics_text"))
+
 
+async def build_lyrics_result(cache_key, artist, song, timestamps, pass_param, sequence, fast, mood, metadata):
+    """Fetch lyrics, run the optional mood/metadata steps and cache the result"""
     # Fetch lyrics
     try:
         result = await asyncio.wait_for(
@@ -257,31 +362,13 @@ async def lyrics(
         )
     except asyncio.TimeoutError:
         logger.error(f"Timeout fetching lyrics for {artist} - {song}")
-        raise HTTPException(
-            status_code=504,
-            detail={
-                "status": "error",
-                "error": {"message": "Request timed out", "details": "Lyrics fetch took too long", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(504, "Request timed out", details="Lyrics fetch took too long")
     except Exception as e:
         logger.error(f"Error fetching lyrics: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch lyrics", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch lyrics", details=str(e))
 
     if not isinstance(result, dict):
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Invalid response from lyrics fetcher", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Invalid response from lyrics fetcher")
 
     # Mood analysis
     if mood and result.get("status") == "success":
@@ -300,28 +387,83 @@ async def lyrics(
     # Metadata
     if metadata and result.get("status") == "success":
         try:
-            metadata_result = enhance_lyrics_with_metadata(result, artist, song)
-            if asyncio.iscoroutine(metadata_result):
-                metadata_result = await asyncio.wait_for(metadata_result, timeout=30)
-            result = metadata_result
+            result = await asyncio.wait_for(enhance_lyrics_with_metadata(result, artist, song), timeout=30)
             logger.info(f"Metadata enhanced for {artist} - {song}")
         except Exception as e:
             logger.warning(f"Metadata enhancement failed: {str(e)}")
             result["metadata_error"] = f"Could not retrieve metadata: {str(e)}"
 
     # Cache
-    if result.get("status") == "success":
-        data = result.get("data", {})
-        if data.get("lyrics") or data.get("plain_lyrics") or data.get("lyrics_text"):
-            try:
-                save_to_cache(cache_key, result)
-                logger.info(f"Result cached for {artist} - {song}")
-            except Exception as e:
-                logger.warning(f"Cache save failed: {str(e)}")
+    if is_cacheable(result):
+        try:
+            await cache_async.aset(cache_key, result, ex=CACHE_TTL)
+            logger.info(f"Result cached for {artist} - {song}")
+        except Exception as e:
+            logger.warning(f"Cache save failed: {str(e)}")
 
     return result
 
 
+@app.get("/lyrics/")
+@limiter.limit("15/minute")
+async def lyrics(
+    request: Request,
+    artist: str = None,
+    song: str = None,
+    country: str = "US",
+    timestamps: bool = False,
+    timestamp: bool = False,
+    pass_param: bool = False,
+    sequence: str = None,
+    fast: bool = False,
+    mood: bool = False,
+    metadata: bool = False,
+):
+    """Fetch lyrics with optional mood analysis and metadata"""
+    artist = (artist or "").strip()
+    song = (song or "").strip()
+    country = country.strip().upper()
+    timestamps = timestamps or timestamp
+    
+    if not artist or not song:
+        raise error_response(400, "Artist and song name are required")
+
+    if pass_param and not sequence:
+        raise error_response(400, "Sequence parameter is required when pass=true")
+
+    logger.info(f"Lyrics request: {artist} - {song} (fast={fast}, mood={mood}, metadata={metadata})")
+
+    try:
+        _analytics_queue.put_nowait((request.state.client_ip, f"{artist} - {song}", country))
+    except asyncio.QueueFull:
+        logger.warning("Analytics queue full, dropping user query")
+
+    # Check cache
+    # the ETag is derived from the cached body, so revalidation only succeeds while it's unchanged
+    cache_key = make_cache_key(artist, song, timestamps, sequence, fast, mood, metadata)
+    cached = await cache_async.aget(cache_key)
+    if cached:
+        logger.info(f"Cache hit for {artist} - {song}")
+        return lyrics_response(cached, request)
+
+    # Fetch lyrics (coalesced with any identical request already in flight)
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(build_lyrics_result(
+            cache_key, artist, song, timestamps, pass_param, sequence, fast, mood, metadata
+        ))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    else:
+        logger.info(f"Joining in-flight fetch for {artist} - {song}")
+
+    # shield: one client disconnecting must not cancel the fetch for the others
+    result = await asyncio.shield(task)
+    if is_cacheable(result):
+        return lyrics_response(result, request)
+    return lyrics_response(result)
+
+
 @app.get("/metadata/")
 @limiter.limit("15/minute")
 async def metadata_endpoint(request: Request, artist: str = None, song: str = None):
@@ -330,38 +472,30 @@ async def metadata_endpoint(request: Request, artist: str = None, song: str = No
     song = (song or "").strip()
 
     if not artist or not song:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": {"message": "Artist and song name are required", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(400, "Artist and song name are required")
 
     logger.info(f"Metadata request for {artist} - {song}")
 
     try:
-        result = get_metadata_only(artist, song)
-        if asyncio.iscoroutine(result):
-            result = await asyncio.wait_for(result, timeout=30)
+        result = await asyncio.wait_for(get_metadata_only(artist, song), timeout=30)
+        if isinstance(result, dict) and result.get("status") == "success":
+            # weak: everything but the per-response timestamp
+            etag = make_etag(dumps_json([result["metadata"], result["sources"]]), weak=True)
+            cached_response = not_modified(request, etag)
+            if cached_response:
+                return cached_response
+            return ORJSONResponse(content=result, headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL})
         return result
     except asyncio.TimeoutError:
-        raise HTTPException(
-            status_code=504,
-            detail={
-                "status": "error",
-                "error": {"message": "Request timed out", "details": "Metadata fetch took too long", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(504, "Request timed out", details="Metadata fetch took too long")
     except Exception as e:
         logger.error(f"Metadata fetch error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch metadata", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch metadata", details=str(e))
+
+
+def _trending_etag(charts) -> str:
+    # weak: the chart content, not the per-response timestamp
+    return make_etag(dumps_json(charts), weak=True)
 
 
 @app.get("/trending/")
@@ -375,59 +509,63 @@ async def trending(request: Request, country: str = "US", countries: str = "", l
 
     try:
         if country and not countries:
-            try:
-                country_enum = Country[country]
-                trending_songs = trending_engine.fetch_trending_songs(country_enum, limit)
-                return {
-                    "status": "success",
-                    "data": {
-                        "country": country,
-                        "trending": [song.to_dict() for song in trending_songs],
-                        "total": len(trending_songs),
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    }
+            country_enum = _COUNTRY_BY_NAME.get(country)
+            if country_enum is None:
+                raise error_response(400, f"Invalid country code: {country}", valid_countries=_VALID_COUNTRIES)
+            trending_songs = await run_in_threadpool(trending_engine.fetch_trending_songs, country_enum, limit)
+            trending_list = [song.to_dict() for song in trending_songs]
+            etag = _trending_etag(trending_list)
+            cached_response = not_modified(request, etag)
+            if cached_response:
+                return cached_response
+            return ORJSONResponse(content={
+                "status": "success",
+                "data": {
+                    "country": country,
+                    "trending": trending_list,
+                    "total": len(trending_songs),
+                    "timestamp": utcnow_iso()
                 }
-            except KeyError:
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "status": "error",
-                        "error": {"message": f"Invalid country code: {country}", "valid_countries": [c.value for c in Country], "timestamp": datetime.now(timezone.utc).isoformat()}
-                    }
-                )
+            }, headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL})
 
         elif countries:
-            country_list = [c.strip().upper() for c in countries.split(",")]
-            trending_data = {}
-            for c in country_list:
-                try:
-                    country_enum = Country[c]
-                    trending_songs = trending_engine.fetch_trending_songs(country_enum, limit)
-                    trending_data[c] = [song.to_dict() for song in trending_songs]
-                except KeyError:
+            country_list = []
+            for c in (c.strip().upper() for c in countries.split(",")):
+                if c in _COUNTRY_BY_NAME:
+                    country_list.append(c)
+                else:
                     logger.warning(f"Invalid country code: {c}")
+
+            async def fetch_country(c):
+                async with _trending_fanout:
+                    return await run_in_threadpool(trending_engine.fetch_trending_songs, _COUNTRY_BY_NAME[c], limit)
+
+            results = await asyncio.gather(*(fetch_country(c) for c in country_list), return_exceptions=True)
+            trending_data = {}
+            for c, trending_songs in zip(country_list, results):
+                if isinstance(trending_songs, Exception):
+                    logger.warning(f"Trending fetch failed for {c}: {trending_songs}")
                     continue
+                trending_data[c] = [song.to_dict() for song in trending_songs]
 
-            return {
+            etag = _trending_etag(trending_data)
+            cached_response = not_modified(request, etag)
+            if cached_response:
+                return cached_response
+            return ORJSONResponse(content={
                 "status": "success",
-                "data": {"countries": trending_data, "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
+                "data": {"countries": trending_data, "timestamp": utcnow_iso()}
+            }, headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL})
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Trending fetch error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch trending data", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch trending data", details=str(e))
 
 
 @app.get("/analytics/top-queries/")
 @limiter.limit("15/minute")
-async def top_queries(request: Request, limit: int = 20, country: str = "", days: int = None):
+async def top_queries(request: Request, response: Response, limit: int = 20, country: str = "", days: int = None):
     """Get top user queries globally or by country"""
     limit = max(1, min(limit, 100))
     country = country.strip().upper() if country else None
@@ -435,7 +573,8 @@ async def top_queries(request: Request, limit: int = 20, country: str = "", days
     logger.info(f"Top queries request: limit={limit}, country={country}, days={days}")
 
     try:
-        top_q = trending_engine.get_top_queries(limit=limit, country=country, days=days)
+        top_q = await run_in_threadpool(trending_engine.get_top_queries, limit=limit, country=country, days=days)
+        response.headers["Cache-Control"] = ANALYTICS_CACHE_CONTROL
         return {
             "status": "success",
             "data": {
@@ -443,29 +582,24 @@ async def top_queries(request: Request, limit: int = 20, country: str = "", days
                 "time_window": f"{days} days" if days else "all_time",
                 "top_queries": [{"query": q, "count": c} for q, c in top_q],
                 "total_unique": len(top_q),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": utcnow_iso()
             }
         }
     except Exception as e:
         logger.error(f"Top queries fetch error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch top queries", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch top queries", details=str(e))
 
 
 @app.get("/analytics/trending-by-country/")
 @limiter.limit("15/minute")
-async def trending_by_country(request: Request, limit: int = 10):
+async def trending_by_country(request: Request, response: Response, limit: int = 10):
     """Get top queries for each country"""
     limit = max(1, min(limit, 100))
     logger.info(f"Trending by country request: limit={limit}")
 
     try:
-        top_by_country = trending_engine.get_top_queries_by_country(limit=limit)
+        top_by_country = await run_in_threadpool(trending_engine.get_top_queries_by_country, limit=limit)
+        response.headers["Cache-Control"] = ANALYTICS_CACHE_CONTROL
         return {
             "status": "success",
             "data": {
@@ -474,88 +608,62 @@ async def trending_by_country(request: Request, limit: int = 10):
                     for country, queries in top_by_country.items()
                 },
                 "total_countries": len(top_by_country),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": utcnow_iso()
             }
         }
     except Exception as e:
         logger.error(f"Trending by country error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch trending by country", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch trending by country", details=str(e))
 
 
 @app.get("/analytics/trending-vs-queries/")
 @limiter.limit("15/minute")
-async def trending_vs_queries(request: Request, country: str = "US", limit: int = 10):
+async def trending_vs_queries(request: Request, response: Response, country: str = "US", limit: int = 10):
     """Compare trending songs with top user queries"""
     country = country.strip().upper()
     limit = max(1, min(limit, 100))
     logger.info(f"Trending vs queries request: country={country}, limit={limit}")
 
+    country_enum = _COUNTRY_BY_NAME.get(country)
+    if country_enum is None:
+        raise error_response(400, f"Invalid country code: {country}", valid_countries=_VALID_COUNTRIES)
+
     try:
-        country_enum = Country[country]
-        comparison = trending_engine.get_trending_vs_user_queries(country_enum, limit)
+        comparison = await run_in_threadpool(trending_engine.get_trending_vs_user_queries, country_enum, limit)
+        response.headers["Cache-Control"] = ANALYTICS_CACHE_CONTROL
         return {"status": "success", "data": comparison}
-    except KeyError:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": {"message": f"Invalid country code: {country}", "valid_countries": [c.value for c in Country], "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
     except Exception as e:
         logger.error(f"Trending vs queries error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch trending vs queries", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch trending vs queries", details=str(e))
 
 
 @app.get("/analytics/trending-intersection/")
 @limiter.limit("15/minute")
-async def trending_intersection(request: Request, country: str = "US", limit: int = 10):
+async def trending_intersection(request: Request, response: Response, country: str = "US", limit: int = 10):
     """Find queries that match trending songs"""
     country = country.strip().upper()
     limit = max(1, min(limit, 100))
     logger.info(f"Trending intersection request: country={country}, limit={limit}")
 
+    country_enum = _COUNTRY_BY_NAME.get(country)
+    if country_enum is None:
+        raise error_response(400, f"Invalid country code: {country}", valid_countries=_VALID_COUNTRIES)
+
     try:
-        country_enum = Country[country]
-        matches = trending_engine.get_trending_intersection(country_enum, limit)
+        matches = await run_in_threadpool(trending_engine.get_trending_intersection, country_enum, limit)
+        response.headers["Cache-Control"] = ANALYTICS_CACHE_CONTROL
         return {
             "status": "success",
             "data": {
                 "country": country,
                 "matches": matches,
                 "total_matches": len(matches),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": utcnow_iso()
             }
         }
-    except KeyError:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": {"message": f"Invalid country code: {country}", "valid_countries": [c.value for c in Country], "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
     except Exception as e:
         logger.error(f"Trending intersection error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch trending intersection", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch trending intersection", details=str(e))
 
 
 @app.get("/api/jiosaavn/search")
@@ -565,39 +673,19 @@ async def jiosaavn_search_endpoint(request: Request, q: str = None):
     q = (q or "").strip()
     
     if not q:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": {"message": "Query parameter 'q' is required", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(400, "Query parameter 'q' is required")
 
     logger.info(f"JioSaavn search query: {q}")
 
     try:
-        results = search_jiosaavn(q)
-        if asyncio.iscoroutine(results):
-            results = await asyncio.wait_for(results, timeout=30)
+        results = await asyncio.wait_for(search_jiosaavn(q), timeout=30)
         return {"status": "success", "results": results}
     except asyncio.TimeoutError:
         logger.error(f"Timeout searching JioSaavn for: {q}")
-        raise HTTPException(
-            status_code=504,
-            detail={
-                "status": "error",
-                "error": {"message": "Request timed out", "details": "JioSaavn search took too long", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(504, "Request timed out", details="JioSaavn search took too long")
     except Exception as e:
         logger.error(f"JioSaavn search error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to search JioSaavn", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to search JioSaavn", details=str(e))
 
 
 @app.get("/api/jiosaavn/play")
@@ -607,94 +695,51 @@ async def jiosaavn_play_endpoint(request: Request, songLink: str = None):
     song_link = (songLink or "").strip()
     
     if not song_link:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "error": {"message": "songLink parameter is required", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(400, "songLink parameter is required")
 
     logger.info(f"JioSaavn play request for: {song_link}")
 
     try:
-        data = get_jiosaavn_stream(song_link)
-        if asyncio.iscoroutine(data):
-            data = await asyncio.wait_for(data, timeout=30)
+        data = await asyncio.wait_for(get_jiosaavn_stream(song_link), timeout=30)
         
         if not data or not isinstance(data, dict):
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "status": "error",
-                    "error": {"message": "Invalid response from JioSaavn", "timestamp": datetime.now(timezone.utc).isoformat()}
-                }
-            )
+            raise error_response(500, "Invalid response from JioSaavn")
 
         if not data.get("stream_url"):
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "status": "error",
-                    "error": {"message": "Unable to fetch stream URL", "timestamp": datetime.now(timezone.utc).isoformat()}
-                }
-            )
+            raise error_response(500, "Unable to fetch stream URL")
 
         return {"status": "success", "data": data}
     except asyncio.TimeoutError:
         logger.error(f"Timeout fetching stream for: {song_link}")
-        raise HTTPException(
-            status_code=504,
-            detail={
-                "status": "error",
-                "error": {"message": "Request timed out", "details": "Stream fetch took too long", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(504, "Request timed out", details="Stream fetch took too long")
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"JioSaavn play error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to fetch stream", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to fetch stream", details=str(e))
 
 
 @app.get("/app")
 async def app_page():
     """Serve the web-based music application"""
     try:
-        return FileResponse("templates/index.html")
+        return FileResponse("templates/index.html", headers={"Cache-Control": "public, max-age=600"})
     except Exception as e:
         logger.error(f"Failed to render app page: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to load application", "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to load application")
 
 
 @app.get("/cache/stats")
 @limiter.limit("15/minute")
-async def route_cache_stats(request: Request):
+async def route_cache_stats(request: Request, response: Response):
     """Get cache statistics and information"""
     try:
         stats = cache_stats()
+        response.headers["Cache-Control"] = "no-store"
         return {"status": "success", **stats}
     except Exception as e:
         logger.error(f"Cache stats error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to retrieve cache stats", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to retrieve cache stats", details=str(e))
 
 
 @app.post("/admin/cache/clear")
@@ -704,18 +749,12 @@ async def admin_clear_cache(request: Request):
         raise HTTPException(status_code=403, detail={"error": "unauthorized"})
     
     try:
-        result = clear_cache()
+        result = await cache_async.aclear()
         logger.info("Cache cleared")
         return {"status": "cache cleared", "details": result}
     except Exception as e:
         logger.error(f"Cache clear error: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "status": "error",
-                "error": {"message": "Failed to clear cache", "details": str(e), "timestamp": datetime.now(timezone.utc).isoformat()}
-            }
-        )
+        raise error_response(500, "Failed to clear cache", details=str(e))
 
 
 @app.get("/admin/cache/stats")
@@ -730,17 +769,17 @@ async def admin_cache_stats(request: Request):
 @app.get("/favicon.ico")
 async def favicon():
     """Favicon endpoint"""
-    return "", 204
+    return Response(status_code=204, headers={"Cache-Control": "public, max-age=604800"})
 
 
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
     """Handle 404 errors"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={
             "status": "error",
-            "error": {"message": "Endpoint not found", "timestamp": datetime.now(timezone.utc).isoformat()}
+            "error": {"message": "Endpoint not found", "timestamp": utcnow_iso()}
         }
     )
 
@@ -749,11 +788,11 @@ async def not_found_handler(request: Request, exc):
 async def internal_error_handler(request: Request, exc):
     """Handle 500 errors"""
     logger.error(f"Internal server error: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "status": "error",
-            "error": {"message": "Internal server error", "timestamp": datetime.now(timezone.utc).isoformat()}
+            "error": {"message": "Internal server error", "timestamp": utcnow_iso()}
         }
     )
 
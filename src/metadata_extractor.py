@@ -1,9 +1,17 @@
-import requests
+import asyncio
+import httpx
 import logging
-from typing import Optional, Dict
-from functools import lru_cache
-from datetime import datetime
-from bs4 import BeautifulSoup
+import math
+import re
+from html import unescape
+import orjson
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
+from contextvars import ContextVar
+from time import gmtime, monotonic, strftime, time
+from urllib.parse import quote
+from lxml import etree, html as lxml_html
+from src import cache_async
 
 logger = logging.getLogger("metadata_extractor")
 
@@ -13,32 +21,143 @@ MUSICBRAINZ_API = "https://musicbrainz.org/ws/2"
 WIKIPEDIA_API = "https://en.wikipedia.org/api/rest_v1"
 ITUNES_API = "https://itunes.apple.com/search"
 
-def get_musicbrainz_metadata(artist: str, song: str) -> Optional[Dict]:
+# Metadata rarely changes; misses are kept briefly so unknown songs aren't re-queried on every request
+METADATA_TTL = 7 * 24 * 3600  # seconds
+METADATA_NEGATIVE_TTL = 3600  # seconds
+# Results with a throttled or failing provider are incomplete, not misses: local tier only, briefly
+METADATA_DEGRADED_TTL = 60  # seconds
+REQUEST_TIMEOUT = 5.0  # seconds, per provider call
+
+class _TokenBucket:
+    """Token bucket allowing `rate` requests per `per` seconds"""
+    def __init__(self, rate: int, per: float = 1.0):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = monotonic()
+    
+    async def acquire(self, max_wait: float) -> bool:
+        """Take a token, waiting at most `max_wait` seconds; False if the wait would be longer"""
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+        wait = (1 - self.tokens) / self.fill_rate
+        if wait > max_wait:
+            # the request would time out in the queue anyway - don't add to the debt
+            return False
+        # reserve a token (possibly going negative) and sleep off the debt
+        self.tokens -= 1
+        if self.tokens < 0:
+            try:
+                await asyncio.sleep(-self.tokens / self.fill_rate)
+            except asyncio.CancelledError:
+                # hand the slot back so later waiters don't queue behind a dead request
+                self.tokens += 1
+                raise
+        return True
+
+# Per-host request budgets; MusicBrainz answers 503 above 1 req/s. Unlisted hosts are unthrottled.
+_LIMITERS = {
+    "musicbrainz.org": _TokenBucket(1, 1.0),
+    "www.last.fm": _TokenBucket(5, 1.0),
+}
+
+# Set by _query_providers to a list that collects the providers that failed rather than
+# missed; tasks it spawns inherit the same list through the copied context
+_provider_failures: ContextVar[Optional[List[str]]] = ContextVar("provider_failures", default=None)
+
+def _provider_failed(name: str):
+    failures = _provider_failures.get()
+    if failures is not None:
+        failures.append(name)
+
+class _RateLimitedTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request):
+        bucket = _LIMITERS.get(request.url.host)
+        if bucket is not None and not await bucket.acquire(REQUEST_TIMEOUT):
+            raise httpx.PoolTimeout(f"Rate limit queue for {request.url.host} is full", request=request)
+        response = await super().handle_async_request(request)
+        if response.status_code == 429 or response.status_code >= 500:
+            _provider_failed(request.url.host)
+        return response
+
+# One HTTP/2 client for every provider: requests to a host share a connection
+# and repeated headers are HPACK-compressed
+_client = None
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            transport=_RateLimitedTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+                retries=2
+            ),
+            headers={"User-Agent": "Lyrica/1.0 (lyrics API)"},
+            timeout=REQUEST_TIMEOUT
+        )
+    return _client
+
+async def close():
+    """Close the provider HTTP client (call this on app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# Validators from earlier responses: (url, params) -> (etag, last_modified, parsed body).
+# Kept independently of the metadata TTL so an expired entry can revalidate to a 304.
+_VALIDATOR_CACHE_SIZE = 4096
+_validators = OrderedDict()
+
+async def _get_json(url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+    """GET a JSON document, sending If-None-Match/If-Modified-Since when we've seen it before"""
+    key = (url, tuple(sorted(params.items())) if params else ())
+    known = _validators.get(key)
+    
+    headers = {}
+    if known:
+        etag, last_modified, _ = known
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
+    response = await _get_client().get(url, params=params, headers=headers)
+    if response.status_code == 304 and known:
+        return known[2]
+    if response.status_code != 200:
+        return None
+    
+    data = orjson.loads(response.content)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _validators[key] = (etag, last_modified, data)
+        _validators.move_to_end(key)
+        while len(_validators) > _VALIDATOR_CACHE_SIZE:
+            _validators.popitem(last=False)
+    return data
+
+async def get_musicbrainz_metadata(artist: str, song: str) -> Optional[Dict]:
     """
     Get metadata from MusicBrainz API (free, no auth required)
     Returns: MBID, recording info, release info, tags, etc.
     """
     try:
-        # Search for recording with additional includes for more data
-        headers = {
-            "User-Agent": "Lyrica/1.0 (lyrics API)"
-        }
+        # Search results already carry tags, releases (with release group) and artist
+        # credits, so no "inc" is sent. Restricting to official releases keeps
+        # bootleg/promo candidates out of the match.
         params = {
-            "query": f'"{song}" AND artist:"{artist}"',
+            "query": f'"{song}" AND artist:"{artist}" AND status:official',
             "fmt": "json",
-            "limit": 1,
-            "inc": "tags+releases+artist-credits"  # Enhanced: Include tags and artist credits
+            "limit": 1
         }
         
-        response = requests.get(
-            f"{MUSICBRAINZ_API}/recording",
-            params=params,
-            headers=headers,
-            timeout=5
-        )
+        data = await _get_json(f"{MUSICBRAINZ_API}/recording", params=params)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if data.get("recordings") and len(data["recordings"]) > 0:
                 recording = data["recordings"][0]
                 logger.info(f"Found MusicBrainz metadata: {artist} - {song}")
@@ -48,54 +167,54 @@ def get_musicbrainz_metadata(artist: str, song: str) -> Optional[Dict]:
         return None
     except Exception as e:
         logger.error(f"MusicBrainz error: {str(e)}")
+        _provider_failed("MusicBrainz")
         return None
 
-def get_wikipedia_summary(artist: str, song: str) -> Optional[Dict]:
+async def _get_wikipedia_page(page_title: str) -> Optional[Dict]:
+    url = f"{WIKIPEDIA_API}/page/summary/{quote(page_title)}"
+    data = await _get_json(url)
+    if data is not None:
+        if "extract" in data:
+            return {
+                "description": data.get("extract", ""),
+                "thumbnail": data.get("thumbnail", {}).get("source", ""),
+                "url": data.get("content_urls", {}).get("desktop", {}).get("page", "")
+            }
+    return None
+
+async def get_wikipedia_summary(artist: str, song: str) -> Optional[Dict]:
     """
     Get summary from Wikipedia API (free, no auth required)
     Searches for the song page and returns extract, thumbnail, etc.
     """
     try:
-        # Construct potential page title (e.g., "Song Title (song)")
-        page_title = f"{song} (song)"
-        url = f"{WIKIPEDIA_API}/page/summary/{requests.utils.quote(page_title)}"
-        
-        headers = {
-            "User-Agent": "Lyrica/1.0 (lyrics API)"
-        }
-        
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if "extract" in data:
-                logger.info(f"Found Wikipedia summary for: {artist} - {song}")
-                return {
-                    "description": data.get("extract", ""),
-                    "thumbnail": data.get("thumbnail", {}).get("source", ""),
-                    "url": data.get("content_urls", {}).get("desktop", {}).get("page", "")
-                }
+        # Both candidate titles are requested at once; "Song Title (song)" still wins when it exists,
+        # and a failure on one doesn't throw away the other
+        summary, fallback = await asyncio.gather(
+            _get_wikipedia_page(f"{song} (song)"), _get_wikipedia_page(song), return_exceptions=True
+        )
+        if isinstance(summary, Exception):
+            logger.error(f"Wikipedia error: {str(summary)}")
+            _provider_failed("Wikipedia")
+        elif summary:
+            logger.info(f"Found Wikipedia summary for: {artist} - {song}")
+            return summary
         
-        # Fallback: Try without "(song)"
-        page_title = song
-        url = f"{WIKIPEDIA_API}/page/summary/{requests.utils.quote(page_title)}"
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if "extract" in data:
-                logger.info(f"Found Wikipedia fallback summary for: {artist} - {song}")
-                return {
-                    "description": data.get("extract", ""),
-                    "thumbnail": data.get("thumbnail", {}).get("source", ""),
-                    "url": data.get("content_urls", {}).get("desktop", {}).get("page", "")
-                }
+        if isinstance(fallback, Exception):
+            logger.error(f"Wikipedia error: {str(fallback)}")
+            _provider_failed("Wikipedia")
+        elif fallback:
+            logger.info(f"Found Wikipedia fallback summary for: {artist} - {song}")
+            return fallback
         
         logger.warning(f"Wikipedia: Page not found for {artist} - {song}")
         return None
     except Exception as e:
         logger.error(f"Wikipedia error: {str(e)}")
+        _provider_failed("Wikipedia")
         return None
 
-def get_itunes_metadata(artist: str, song: str) -> Optional[Dict]:
+async def get_itunes_metadata(artist: str, song: str) -> Optional[Dict]:
     """
     Get metadata from iTunes Search API (free, no auth required)
     Returns: album, artwork, release date, duration, genre, etc.
@@ -107,9 +226,9 @@ def get_itunes_metadata(artist: str, song: str) -> Optional[Dict]:
             "entity": "song",
             "limit": 1
         }
-        response = requests.get(ITUNES_API, params=params, timeout=5)
+        response = await _get_client().get(ITUNES_API, params=params)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("resultCount", 0) > 0:
                 track = data["results"][0]
                 logger.info(f"Found iTunes metadata: {artist} - {song}")
@@ -128,45 +247,92 @@ def get_itunes_metadata(artist: str, song: str) -> Optional[Dict]:
         return None
     except Exception as e:
         logger.error(f"iTunes error: {str(e)}")
+        _provider_failed("iTunes")
         return None
 
-def get_lastfm_metadata(artist: str, song: str) -> Optional[Dict]:
+def _has_class(name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+# Compiled once; equivalent to the old CSS selectors
+_LFM_XPATHS = {
+    "listeners": etree.XPath(f'//li[@data-analytics-label="listener_count"]//*[{_has_class("metadata-display")}]'),
+    "playcount": etree.XPath(f'//li[@data-analytics-label="scrobble_count"]//*[{_has_class("metadata-display")}]'),
+    "tags": etree.XPath(f'//*[{_has_class("tags-list--global")}]//a'),
+    "album": etree.XPath(f'//*[{_has_class("header-metadata-title")}]//a'),
+}
+
+def _first_int(elems) -> int:
+    if not elems:
+        return 0
+    try:
+        return int(elems[0].text_content().strip().replace(',', ''))
+    except ValueError:
+        return 0
+
+# Regex fast path over the raw page; keyed to the same stable attributes as the XPaths above
+_RE_LISTENERS = re.compile(r'data-analytics-label="listener_count".*?metadata-display[^>]*>\s*([\d,]+)', re.DOTALL)
+_RE_SCROBBLES = re.compile(r'data-analytics-label="scrobble_count".*?metadata-display[^>]*>\s*([\d,]+)', re.DOTALL)
+_RE_TAGS_BLOCK = re.compile(r'tags-list--global[^>]*>(.*?)</ul>', re.DOTALL)
+_RE_ALBUM = re.compile(r'header-metadata-title.*?<a[^>]*>([^<]+)</a>', re.DOTALL)
+_RE_LINK_TEXT = re.compile(r'<a[^>]*>([^<]+)</a>')
+
+def _parse_lastfm_regex(page: str) -> Optional[Tuple[int, int, List[str], str]]:
+    """Returns (listeners, playcount, tags, album), or None if the page layout didn't match"""
+    listeners = _RE_LISTENERS.search(page)
+    playcount = _RE_SCROBBLES.search(page)
+    if not listeners or not playcount:
+        return None
+    
+    tags_block = _RE_TAGS_BLOCK.search(page)
+    tags = [unescape(t).strip() for t in _RE_LINK_TEXT.findall(tags_block.group(1))[:7]] if tags_block else []
+    album = _RE_ALBUM.search(page)
+    return (
+        int(listeners.group(1).replace(',', '')),
+        int(playcount.group(1).replace(',', '')),
+        tags,
+        unescape(album.group(1)).strip() if album else ""
+    )
+
+def _parse_lastfm_lxml(content: bytes) -> Tuple[int, int, List[str], str]:
+    # raw bytes: lxml detects the encoding itself
+    tree = lxml_html.fromstring(content)
+    album_elems = _LFM_XPATHS["album"](tree)
+    return (
+        _first_int(_LFM_XPATHS["listeners"](tree)),
+        _first_int(_LFM_XPATHS["playcount"](tree)),
+        [tag.text_content().strip() for tag in _LFM_XPATHS["tags"](tree)[:7]],
+        album_elems[0].text_content().strip() if album_elems else ""
+    )
+
+LASTFM_MAX_BYTES = 64 * 1024
+
+async def _read_lastfm_head(response: httpx.Response) -> bytes:
+    """Read the page until every field has been seen (or the byte cap is hit)"""
+    buf = bytearray()
+    async for chunk in response.aiter_bytes(8192):
+        buf += chunk
+        if len(buf) >= LASTFM_MAX_BYTES:
+            break
+        page = buf.decode("utf-8", "ignore")
+        if _RE_TAGS_BLOCK.search(page) and _parse_lastfm_regex(page):
+            break
+    return bytes(buf)
+
+async def get_lastfm_metadata(artist: str, song: str) -> Optional[Dict]:
     """
     Scrape metadata from Last.fm public page (no API key required)
     Returns: playcount, listeners, tags, etc.
     """
     try:
-        url = f"https://www.last.fm/music/{requests.utils.quote(artist)}/_/{requests.utils.quote(song)}"
-        headers = {"User-Agent": "Lyrica/1.0 (lyrics API)"}
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract listeners
-            listeners_elem = soup.select_one('li[data-analytics-label="listener_count"] .metadata-display')
-            listeners = 0
-            if listeners_elem:
-                listeners_text = listeners_elem.text.strip().replace(',', '')
-                if listeners_text.isdigit():
-                    listeners = int(listeners_text)
-            
-            # Extract playcount (scrobbles)
-            playcount_elem = soup.select_one('li[data-analytics-label="scrobble_count"] .metadata-display')
-            playcount = 0
-            if playcount_elem:
-                playcount_text = playcount_elem.text.strip().replace(',', '')
-                if playcount_text.isdigit():
-                    playcount = int(playcount_text)
-            
-            # Extract tags
-            tags = []
-            tag_elements = soup.select('.tags-list--global a')
-            for tag in tag_elements[:7]:
-                tags.append(tag.text.strip())
-            
-            # Extract album if available
-            album_elem = soup.select_one('.header-metadata-title a')
-            album = album_elem.text.strip() if album_elem else ""
+        url = f"https://www.last.fm/music/{quote(artist)}/_/{quote(song)}"
+        # stream the page and reset the stream once the header fields are in,
+        # so the rest of the (200KB+) document never crosses the wire
+        async with _get_client().stream("GET", url) as response:
+            content = await _read_lastfm_head(response) if response.status_code == 200 else b""
+        if content:
+            # building a DOM for a few fields is wasteful; lxml only runs if the regexes miss
+            page = content.decode("utf-8", "ignore")
+            listeners, playcount, tags, album = _parse_lastfm_regex(page) or _parse_lastfm_lxml(content)
             
             if listeners or playcount or tags:
                 logger.info(f"Found Last.fm scraped metadata: {artist} - {song}")
@@ -182,45 +348,57 @@ def get_lastfm_metadata(artist: str, song: str) -> Optional[Dict]:
         return None
     except Exception as e:
         logger.error(f"Last.fm scrape error: {str(e)}")
+        _provider_failed("Last.fm")
         return None
 
-def get_cover_art(mbid: str) -> Optional[str]:
+async def get_cover_art(mbid: str, release_group_id: str = "") -> Optional[str]:
     """
     Get album cover art from Cover Art Archive (free)
-    MBID should come from MusicBrainz
+    MBIDs should come from MusicBrainz; the release-group image is tried
+    first since it is shared by every release and cached harder on their CDN
     """
     try:
-        if not mbid:
+        if release_group_id:
+            url = f"{COVER_ART_API}/release-group/{release_group_id}/front-250"
+        elif mbid:
+            url = f"{COVER_ART_API}/release/{mbid}/front"
+        else:
             return None
         
-        response = requests.get(
-            f"{COVER_ART_API}/release/{mbid}/front",
-            timeout=5,
-            allow_redirects=True
-        )
+        # existence check only: HEAD so the image body is never downloaded
+        client = _get_client()
+        response = await client.head(url, follow_redirects=True)
+        if response.status_code == 405:
+            # HEAD not supported: stream and close before reading the body
+            async with client.stream("GET", url, follow_redirects=True) as response:
+                pass
         
-        if response.status_code == 200:
-            logger.info(f"Found cover art for MBID: {mbid}")
-            return f"{COVER_ART_API}/release/{mbid}/front"
+        if response.status_code in (200, 302, 307):
+            logger.info(f"Found cover art for MBID: {release_group_id or mbid}")
+            return url
         
         return None
     except Exception as e:
         logger.error(f"Cover Art error: {str(e)}")
+        _provider_failed("Cover Art")
         return None
 
-@lru_cache(maxsize=500)
-def get_song_metadata(artist: str, song: str) -> Dict:
+def _no_metadata_result(artist: str, song: str) -> Dict:
+    return {
+        "success": False,
+        "error": f"No metadata found for '{song}' by '{artist}'",
+        "sources": []
+    }
+
+def _build_metadata_result(artist: str, song: str, mb_data, cover_art, itunes_data, lastfm_data, wiki_data) -> Dict:
     """
-    Get comprehensive metadata from multiple free APIs
-    
-    Args:
-        artist: Artist name
-        song: Song title
+    Merge the provider responses into a single metadata result
     
     Returns:
         {
             "success": bool,
             "metadata": {...},
+            "formatted": {...},  # format_metadata(metadata), on success
             "sources": [list of APIs used]
         }
     """
@@ -228,8 +406,7 @@ def get_song_metadata(artist: str, song: str) -> Dict:
         metadata = {}
         sources_used = []
         
-        # 1. Fetch from MusicBrainz for core info
-        mb_data = get_musicbrainz_metadata(artist, song)
+        # 1. MusicBrainz for core info
         if mb_data:
             sources_used.append("MusicBrainz")
             
@@ -265,15 +442,11 @@ def get_song_metadata(artist: str, song: str) -> Dict:
             # Set album
             metadata["album"] = release_title
 
-            # Try to get cover art
-            release_mbid = release_id
-            cover_art = get_cover_art(release_mbid)
             if cover_art:
                 metadata["album_art"] = cover_art
                 sources_used.append("Cover Art Archive")
         
-        # 2. Fetch from iTunes for additional details
-        itunes_data = get_itunes_metadata(artist, song)
+        # 2. iTunes for additional details
         if itunes_data:
             sources_used.append("iTunes")
             metadata["title"] = metadata.get("title") or itunes_data["title"]
@@ -287,8 +460,7 @@ def get_song_metadata(artist: str, song: str) -> Dict:
                 metadata["tags"] = [itunes_data["genre"]]
             metadata["itunes_url"] = itunes_data["url"]
         
-        # 3. Scrape from Last.fm for popularity metrics and tags
-        lastfm_data = get_lastfm_metadata(artist, song)
+        # 3. Last.fm for popularity metrics and tags
         if lastfm_data:
             sources_used.append("Last.fm")
             metadata["playcount"] = lastfm_data.get("playcount", 0)
@@ -299,8 +471,7 @@ def get_song_metadata(artist: str, song: str) -> Dict:
                 metadata["album"] = lastfm_data.get("album", "")
             metadata["lastfm_url"] = lastfm_data["url"]
         
-        # 4. Fetch from Wikipedia for description and additional visuals
-        wiki_data = get_wikipedia_summary(artist, song)
+        # 4. Wikipedia for description and additional visuals
         if wiki_data:
             sources_used.append("Wikipedia")
             metadata.update({
@@ -310,20 +481,19 @@ def get_song_metadata(artist: str, song: str) -> Dict:
             })
         
         if not metadata:
-            return {
-                "success": False,
-                "error": f"No metadata found for '{song}' by '{artist}'",
-                "sources": []
-            }
+            return _no_metadata_result(artist, song)
         
         # Calculate popularity score (0-100) from listeners if available
         listeners = metadata.get("listeners", 0)
-        popularity = min(100, max(0, int((listeners / 10000) ** 0.5 * 10))) if listeners else 0  # Adjusted formula for better scaling
+        # sqrt(listeners / 10000) * 10 == sqrt(listeners) / 10, in integer math
+        popularity = min(100, math.isqrt(max(0, int(listeners))) // 10) if listeners else 0
         metadata["popularity"] = popularity
         
         return {
             "success": True,
             "metadata": metadata,
+            # formatted once here and cached with the result, not rebuilt per response
+            "formatted": format_metadata(metadata),
             "sources": sources_used
         }
     
@@ -335,6 +505,177 @@ def get_song_metadata(artist: str, song: str) -> Dict:
             "sources": []
         }
 
+def _cover_art_ids(mb_data: Optional[Dict]) -> Tuple[str, str]:
+    """(release id, release-group id) of the first release; search results embed the release group"""
+    releases = (mb_data or {}).get("releases") or []
+    if not releases:
+        return "", ""
+    return releases[0].get("id", ""), (releases[0].get("release-group") or {}).get("id", "")
+
+def _needs_cover_art(mb_data: Optional[Dict], itunes_data: Optional[Dict]) -> bool:
+    # iTunes already returns 1200x1200 artwork; Cover Art Archive is only the fallback
+    return bool(mb_data) and not (itunes_data and itunes_data.get("album_art"))
+
+# Stored in the shared cache in place of a failed lookup
+_NEGATIVE = "NEG"
+
+# Lookups in flight, keyed like the cache, so concurrent callers share one fetch
+_inflight = {}
+
+def _metadata_cache_key(artist: str, song: str) -> str:
+    return f"meta:{artist.strip().lower()}:{song.strip().lower()}"
+
+def _metadata_ttl(result: Dict) -> int:
+    return METADATA_TTL if result.get("success") else METADATA_NEGATIVE_TTL
+
+# Process-local tier in front of the shared cache: key -> (expiry, result)
+_METADATA_CACHE_SIZE = 500
+_metadata_cache = OrderedDict()
+
+def _local_get(key: str):
+    entry = _metadata_cache.get(key)
+    if entry is None:
+        return None
+    if time() > entry[0]:
+        del _metadata_cache[key]
+        return None
+    _metadata_cache.move_to_end(key)
+    return entry[1]
+
+def _local_put(key: str, result: Dict, ttl: int):
+    _metadata_cache[key] = (time() + ttl, result)
+    _metadata_cache.move_to_end(key)
+    while len(_metadata_cache) > _METADATA_CACHE_SIZE:
+        _metadata_cache.popitem(last=False)
+
+async def _musicbrainz_with_cover_art(artist: str, song: str, itunes_task: asyncio.Task):
+    # cover art needs the release MBID, so it is chained here instead of run in parallel
+    mb_data = await get_musicbrainz_metadata(artist, song)
+    try:
+        itunes_data = await asyncio.shield(itunes_task)
+    except Exception:
+        itunes_data = None
+    cover_art = None
+    if _needs_cover_art(mb_data, itunes_data):
+        cover_art = await get_cover_art(*_cover_art_ids(mb_data))
+    return mb_data, cover_art
+
+async def _query_providers(artist: str, song: str) -> Tuple[Dict, bool]:
+    """(merged result, complete); complete is False when any provider was throttled or errored"""
+    failures = []
+    token = _provider_failures.set(failures)
+    try:
+        itunes_task = asyncio.create_task(get_itunes_metadata(artist, song))
+        results = await asyncio.gather(
+            _musicbrainz_with_cover_art(artist, song, itunes_task),
+            itunes_task,
+            get_lastfm_metadata(artist, song),
+            get_wikipedia_summary(artist, song),
+            return_exceptions=True
+        )
+    finally:
+        _provider_failures.reset(token)
+    for r in results:
+        if isinstance(r, Exception):
+            logger.error(f"Metadata provider error: {str(r)}")
+            failures.append(type(r).__name__)
+    mb_result, itunes_data, lastfm_data, wiki_data = [
+        None if isinstance(r, Exception) else r for r in results
+    ]
+    mb_data, cover_art = mb_result or (None, None)
+
+    result = _build_metadata_result(artist, song, mb_data, cover_art, itunes_data, lastfm_data, wiki_data)
+    if failures:
+        logger.warning(f"Incomplete metadata for {artist} - {song}, failed: {', '.join(sorted(set(failures)))}")
+    return result, not failures
+
+async def _fetch_song_metadata(key: str, artist: str, song: str) -> Dict:
+    # shared tier (Redis when configured, else disk) survives restarts and is seen by all workers
+    cached = await cache_async.aget(key)
+    if cached == _NEGATIVE:
+        # known miss: answer without touching any provider
+        result = _no_metadata_result(artist, song)
+        _local_put(key, result, METADATA_NEGATIVE_TTL)
+        return result
+    if cached is not None:
+        _local_put(key, cached, _metadata_ttl(cached))
+        return cached
+
+    result, complete = await _query_providers(artist, song)
+    if not complete:
+        # only real misses may reach the shared cache - a throttled lookup is retried soon
+        _local_put(key, result, METADATA_DEGRADED_TTL)
+        return result
+    ttl = _metadata_ttl(result)
+    _local_put(key, result, ttl)
+    try:
+        await cache_async.aset(key, result if result["success"] else _NEGATIVE, ex=ttl)
+    except Exception as e:
+        logger.warning(f"Metadata cache save failed: {str(e)}")
+    return result
+
+async def get_song_metadata_async(artist: str, song: str) -> Dict:
+    """
+    Get comprehensive metadata, querying all providers concurrently
+    
+    Args:
+        artist: Artist name
+        song: Song title
+    
+    Returns:
+        {
+            "success": bool,
+            "metadata": {...},
+            "formatted": {...},  # format_metadata(metadata), on success
+            "sources": [list of APIs used]
+        }
+    """
+    key = _metadata_cache_key(artist, song)
+    cached = _local_get(key)
+    if cached is not None:
+        return cached
+
+    # join an identical lookup already in flight instead of hitting the providers again
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_song_metadata(key, artist, song))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+# Bounds how many songs of one bulk request are looked up at the same time
+BULK_CONCURRENCY = 8
+
+async def get_metadata_bulk(pairs: List[Tuple[str, str]]) -> List[Dict]:
+    """
+    Get metadata for many (artist, song) pairs, e.g. a whole playlist
+    
+    Args:
+        pairs: (artist, song) tuples
+    
+    Returns:
+        get_song_metadata_async results, in the same order as pairs
+    """
+    sem = asyncio.Semaphore(BULK_CONCURRENCY)
+    
+    async def lookup(artist: str, song: str) -> Dict:
+        async with sem:
+            return await get_song_metadata_async(artist, song)
+    
+    # duplicates in the batch share one lookup
+    unique = {}
+    for artist, song in pairs:
+        unique.setdefault(_metadata_cache_key(artist, song), (artist, song))
+    results = await asyncio.gather(*(lookup(a, s) for a, s in unique.values()), return_exceptions=True)
+    
+    by_key = {}
+    for key, result in zip(unique, results):
+        if isinstance(result, Exception):
+            logger.error(f"Bulk metadata error: {str(result)}")
+            result = {"success": False, "error": str(result), "sources": []}
+        by_key[key] = result
+    return [by_key[_metadata_cache_key(artist, song)] for artist, song in pairs]
+
 def format_metadata(metadata: Dict) -> Dict:
     """
     Format metadata for API response
@@ -346,48 +687,54 @@ def format_metadata(metadata: Dict) -> Dict:
         Formatted metadata with human-readable fields
     """
     try:
+        g = metadata.get
+        
         # Convert milliseconds to seconds and formatted time
-        duration_ms = metadata.get("duration_ms", 0)
+        duration_ms = g("duration_ms", 0)
         duration_sec = duration_ms // 1000 if duration_ms else 0
         minutes = duration_sec // 60
         seconds = duration_sec % 60
         
         # Parse release date
-        release_date = metadata.get("release_date", "")
-        release_year = release_date.split("-")[0] if release_date else ""
+        release_date = g("release_date", "")
+        try:
+            release_year = int(release_date[:4]) if release_date else None
+        except ValueError:
+            release_year = None
+        mbid = g("musicbrainz_id", "")
         
         return {
-            "title": metadata.get("title", ""),
-            "artist": metadata.get("artist", ""),
-            "album": metadata.get("album", metadata.get("release_title", "")),
-            "album_art": metadata.get("album_art", ""),
-            "description": metadata.get("description", ""),
-            "wiki_thumbnail": metadata.get("wiki_thumbnail", ""),
+            "title": g("title", ""),
+            "artist": g("artist", ""),
+            "album": g("album", g("release_title", "")),
+            "album_art": g("album_art", ""),
+            "description": g("description", ""),
+            "wiki_thumbnail": g("wiki_thumbnail", ""),
             "release_date": release_date,
-            "release_year": int(release_year) if release_year.isdigit() else None,
+            "release_year": release_year,
             "duration": {
                 "ms": duration_ms,
                 "seconds": duration_sec,
                 "formatted": f"{minutes}:{seconds:02d}" if duration_sec > 0 else "Unknown"
             },
-            "popularity": metadata.get("popularity", 0),
-            "playcount": metadata.get("playcount", 0),
-            "listeners": metadata.get("listeners", 0),
-            "tags": metadata.get("tags", []),
+            "popularity": g("popularity", 0),
+            "playcount": g("playcount", 0),
+            "listeners": g("listeners", 0),
+            "tags": g("tags", []),
             "links": {
-                "musicbrainz": f"https://musicbrainz.org/recording/{metadata.get('musicbrainz_id', '')}" if metadata.get("musicbrainz_id") else "",
-                "lastfm": metadata.get("lastfm_url", ""),
-                "itunes": metadata.get("itunes_url", ""),
-                "wikipedia": metadata.get("wiki_url", "")
+                "musicbrainz": f"https://musicbrainz.org/recording/{mbid}" if mbid else "",
+                "lastfm": g("lastfm_url", ""),
+                "itunes": g("itunes_url", ""),
+                "wikipedia": g("wiki_url", "")
             },
-            "musicbrainz_id": metadata.get("musicbrainz_id", ""),
-            "release_id": metadata.get("release_id", "")
+            "musicbrainz_id": mbid,
+            "release_id": g("release_id", "")
         }
     except Exception as e:
         logger.error(f"Metadata formatting error: {str(e)}")
         return {}
 
-def enhance_lyrics_with_metadata(lyrics_response: Dict, artist: str, song: str) -> Dict:
+async def enhance_lyrics_with_metadata(lyrics_response: Dict, artist: str, song: str) -> Dict:
     """
     Add metadata to lyrics response
     
@@ -400,10 +747,10 @@ def enhance_lyrics_with_metadata(lyrics_response: Dict, artist: str, song: str)
         Enhanced response with metadata section
     """
     try:
-        metadata_result = get_song_metadata(artist, song)
+        metadata_result = await get_song_metadata_async(artist, song)
         
         if metadata_result["success"]:
-            formatted = format_metadata(metadata_result["metadata"])
+            formatted = metadata_result.get("formatted") or format_metadata(metadata_result["metadata"])
             lyrics_response["metadata"] = formatted
         else:
             lyrics_response["metadata"] = {
@@ -420,7 +767,7 @@ def enhance_lyrics_with_metadata(lyrics_response: Dict, artist: str, song: str)
         }
         return lyrics_response
 
-def get_metadata_only(artist: str, song: str) -> Dict:
+async def get_metadata_only(artist: str, song: str) -> Dict:
     """
     Get only metadata without lyrics
     
@@ -436,23 +783,24 @@ def get_metadata_only(artist: str, song: str) -> Dict:
             "timestamp": str
         }
     """
+    ts = strftime("%Y-%m-%d %H:%M:%S", gmtime())
     try:
-        metadata_result = get_song_metadata(artist, song)
+        metadata_result = await get_song_metadata_async(artist, song)
         
         if metadata_result["success"]:
-            formatted = format_metadata(metadata_result["metadata"])
+            formatted = metadata_result.get("formatted") or format_metadata(metadata_result["metadata"])
             return {
                 "status": "success",
                 "metadata": formatted,
                 "sources": metadata_result["sources"],
-                "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": ts
             }
         else:
             return {
                 "status": "error",
                 "error": metadata_result.get("error", "Metadata fetch failed"),
                 "sources": [],
-                "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": ts
             }
     except Exception as e:
         logger.error(f"Get metadata only error: {str(e)}")
@@ -460,5 +808,5 @@ def get_metadata_only(artist: str, song: str) -> Dict:
             "status": "error",
             "error": str(e),
             "sources": [],
-            "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": ts
         }
\ No newline at end of file
@@ -1,14 +1,19 @@
-from flask import jsonify, request, render_template
-from datetime import datetime, timezone
+from flask import Response, request, render_template
+from flask.json.provider import JSONProvider
 import os
 import asyncio
+import concurrent.futures
 import logging
+import orjson
+import queue
+import threading
 
 from src.logger import get_logger
-from src.cache import make_cache_key, load_from_cache, save_to_cache, clear_cache, cache_stats
+from src.cache import make_cache_key, load_from_cache_raw, save_to_cache, clear_cache, cache_stats
 from src.fetch_controller import fetch_lyrics_controller
 from src.sentiment_analyzer import analyze_sentiment, analyze_word_frequency, extract_lyrics_text
 from src.metadata_extractor import enhance_lyrics_with_metadata, get_metadata_only
+from src.utils import dumps_json, utcnow_iso
 from src.sources.jiosaavan_fetcher import search_jiosaavn, get_jiosaavn_stream
 from src.trending_analytics import TrendingAnalyticsEngine, Country
 
@@ -17,308 +22,356 @@ logger = get_logger("router")
 # Initialize Trending Analytics Engine (global instance)
 trending_engine = TrendingAnalyticsEngine(cache_ttl_hours=24)
 
-# Helper function to run async functions in sync context
-def run_async(coro, timeout=30):
-    """Run async coroutine safely in sync context with timeout"""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import nest_asyncio
-            nest_asyncio.apply()
-            return asyncio.run(coro)
-        return loop.run_until_complete(asyncio.wait_for(coro, timeout=timeout))
-    except asyncio.TimeoutError:
-        logger.error("Async operation timed out")
-        raise Exception("Request timed out - operation took too long")
-    except RuntimeError:
-        return asyncio.run(asyncio.wait_for(coro, timeout=timeout))
+# Upper bound on ?countries= entries per /trending/ request
+MAX_COUNTRIES = 20
+
+# Runs the blocking per-country trending fetches of one request in parallel
+_trending_pool = concurrent.futures.ThreadPoolExecutor(max_workers=10, thread_name_prefix="trending")
+
+# User queries are recorded off the request path, in batches, by one daemon thread
+ANALYTICS_BATCH_SIZE = 32
+_analytics_q = queue.Queue(maxsize=10000)
+
+
+def _analytics_worker():
+    while True:
+        batch = [_analytics_q.get()]
+        while len(batch) < ANALYTICS_BATCH_SIZE:
+            try:
+                batch.append(_analytics_q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            trending_engine.record_user_queries_batch(batch)
+        except Exception as e:
+            logger.warning("Failed to record user queries: %s", e)
+
+
+threading.Thread(target=_analytics_worker, name="router-analytics", daemon=True).start()
+
+_TRUTHY = frozenset(("true", "1", "yes", "on"))
+
+
+def _qbool(name, default="false"):
+    """Boolean query parameter; accepts true/1/yes/on in any case"""
+    return request.args.get(name, default).lower() in _TRUTHY
+
+def _country_arg(default="US"):
+    """Upper-cased ?country= value, or default when absent"""
+    value = request.args.get("country")
+    return value.strip().upper() if value is not None else default
+
+
+def _limit_arg(default, lo=1, hi=100):
+    """?limit= as an int; default when absent, malformed or outside [lo, hi]"""
+    limit = request.args.get("limit", default, type=int)
+    return limit if lo <= limit <= hi else default
+
+# Country lookups, built once instead of per request
+_COUNTRY_BY_NAME = {c.name: c for c in Country}
+_VALID_COUNTRIES = tuple(c.value for c in Country)
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson: compact, unsorted, encoded in C"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_json(obj), mimetype="application/json")
+
+
+def _json(data, status=200):
+    """JSON response encoded with orjson (bytes straight out, no str round trip)"""
+    return Response(dumps_json(data), status=status, mimetype="application/json")
+
+
+def _err(message, status, details=None, extra=None):
+    """Standard error body: {"status": "error", "error": {message, [details], [extra], timestamp}}"""
+    error = {"message": message}
+    if details is not None:
+        error["details"] = details
+    if extra:
+        error.update(extra)
+    error["timestamp"] = utcnow_iso()
+    return _json({"status": "error", "error": error}, status)
+
+
+def invalid_country_response(country):
+    return _err(f"Invalid country code: {country}", 400, extra={"valid_countries": _VALID_COUNTRIES})
+
+# One event loop for the life of the process, run on a daemon thread, so async
+# fetchers keep their HTTP connection pools between requests
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="router-loop", daemon=True).start()
+
+async def run_on_loop(coro, timeout=30):
+    """Await a coroutine on the background loop from an async view with timeout"""
+    # Flask runs each async view on its own short-lived loop; the work itself stays on
+    # _loop so the fetchers' connection pools are only ever used from one loop
+    return await asyncio.wait_for(asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _loop)), timeout)
+
+
+# Lyrics fetches in flight on _loop, keyed by fetch arguments, so concurrent misses share one
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+async def fetch_lyrics_shared(artist, song, timeout=60, **kwargs):
+    """fetch_lyrics_controller, coalescing identical concurrent calls into one upstream fetch"""
+    key = (artist.lower(), song.lower(), tuple(sorted(kwargs.items())))
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = asyncio.run_coroutine_threadsafe(fetch_lyrics_controller(artist, song, **kwargs), _loop)
+            _inflight[key] = future
+            future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: one caller timing out must not cancel the fetch the others are waiting on
+    result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+    # callers add mood/metadata keys to the result, so each gets its own top-level dict
+    return dict(result) if isinstance(result, dict) else result
 
 
 def register_routes(app):
-    @app.route("/")
-    def home():
-        """Main API documentation endpoint"""
-        return jsonify(
-            {
-                "api": "Lyrica",
-                "version": app.config.get("VERSION", "1.0.0"),
-                "status": "active",
-                "description": "A comprehensive lyrics API with mood analysis, metadata extraction, and trending insights",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "endpoints": {
-                    "lyrics": {
-                        "url": "/lyrics/",
-                        "method": "GET",
-                        "description": "Fetch lyrics for a song",
-                        "examples": [
-                            "/lyrics/?artist=The Beatles&song=Imagine",
-                            "/lyrics/?artist=The Beatles&song=Imagine&timestamps=true",
-                            "/lyrics/?artist=The Beatles&song=Imagine&mood=true",
-                            "/lyrics/?artist=The Beatles&song=Imagine&metadata=true",
-                            "/lyrics/?artist=The Beatles&song=Imagine&fast=true&timestamps=true&mood=true&metadata=true"
-                        ]
-                    },
-                    "metadata_only": {
-                        "url": "/metadata/",
-                        "method": "GET",
-                        "description": "Get song metadata without lyrics",
-                        "examples": [
-                            "/metadata/?artist=The Beatles&song=Imagine"
-                        ]
-                    },
-                    "trending": {
-                        "url": "/trending/",
-                        "method": "GET",
-                        "description": "Get trending songs by country",
-                        "examples": [
-                            "/trending/?country=US&limit=20",
-                            "/trending/?country=IN",
-                            "/trending/?countries=US,GB,IN&limit=10"
-                        ]
-                    },
-                    "top_queries": {
-                        "url": "/analytics/top-queries/",
-                        "method": "GET",
-                        "description": "Get top user queries globally or by country",
-                        "examples": [
-                            "/analytics/top-queries/?limit=20",
-                            "/analytics/top-queries/?country=US&limit=10",
-                            "/analytics/top-queries/?country=US&days=7&limit=15"
-                        ]
-                    },
-                    "trending_by_country": {
-                        "url": "/analytics/trending-by-country/",
-                        "method": "GET",
-                        "description": "Get top queries for each country",
-                        "examples": [
-                            "/analytics/trending-by-country/?limit=10"
-                        ]
-                    },
-                    "trending_vs_queries": {
-                        "url": "/analytics/trending-vs-queries/",
-                        "method": "GET",
-                        "description": "Compare trending songs with top user queries",
-                        "examples": [
-                            "/analytics/trending-vs-queries/?country=US&limit=10"
-                        ]
-                    },
-                    "trending_intersection": {
-                        "url": "/analytics/trending-intersection/",
-                        "method": "GET",
-                        "description": "Find queries that match trending songs",
-                        "examples": [
-                            "/analytics/trending-intersection/?country=US&limit=10"
-                        ]
-                    },
-                    "jiosaavn_search": {
-                        "url": "/api/jiosaavn/search",
-                        "method": "GET",
-                        "description": "Search for songs on JioSaavn",
-                        "examples": [
-                            "/api/jiosaavn/search?q=Imagine"
-                        ]
-                    },
-                    "jiosaavn_play": {
-                        "url": "/api/jiosaavn/play",
-                        "method": "GET",
-                        "description": "Get playable stream URL from JioSaavn",
-                        "examples": [
-                            "/api/jiosaavn/play?songLink=<song_link>"
-                        ]
-                    },
-                    "cache_stats": {
-                        "url": "/cache/stats",
-                        "method": "GET",
-                        "description": "Get cache statistics"
-                    },
-                    "music_app": {
-                        "url": "/app",
-                        "method": "GET",
-                        "description": "Access the web-based music application"
-                    }
+    # jsonify, request.get_json and Flask's own JSON go through orjson too
+    app.json = OrjsonProvider(app)
+
+    # The docs payload never changes for a running app: serialise it once, not per hit
+    home_body = dumps_json(
+        {
+            "api": "Lyrica",
+            "version": app.config.get("VERSION", "1.0.0"),
+            "status": "active",
+            "description": "A comprehensive lyrics API with mood analysis, metadata extraction, and trending insights",
+            "endpoints": {
+                "lyrics": {
+                    "url": "/lyrics/",
+                    "method": "GET",
+                    "description": "Fetch lyrics for a song",
+                    "examples": [
+                        "/lyrics/?artist=The Beatles&song=Imagine",
+                        "/lyrics/?artist=The Beatles&song=Imagine&timestamps=true",
+                        "/lyrics/?artist=The Beatles&song=Imagine&mood=true",
+                        "/lyrics/?artist=The Beatles&song=Imagine&metadata=true",
+                        "/lyrics/?artist=The Beatles&song=Imagine&fast=true&timestamps=true&mood=true&metadata=true"
+                    ]
                 },
-                "parameters": {
-                    "artist": {
-                        "type": "string",
-                        "required": True,
-                        "description": "Artist name"
-                    },
-                    "song": {
-                        "type": "string",
-                        "required": True,
-                        "description": "Song title"
-                    },
-                    "country": {
-                        "type": "string",
-                        "required": False,
-                        "description": "Country code (US, GB, IN, BR, JP, DE, FR, CA, AU, MX)"
-                    },
-                    "countries": {
-                        "type": "string",
-                        "required": False,
-                        "description": "Comma-separated country codes"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "required": False,
-                        "default": 20,
-                        "description": "Number of results to return"
-                    },
-                    "days": {
-                        "type": "integer",
-                        "required": False,
-                        "description": "Time window in days for query analytics"
-                    },
-                    "timestamps": {
-                        "type": "boolean",
-                        "required": False,
-                        "default": False,
-                        "description": "Include synchronized timestamps with lyrics"
-                    },
-                    "mood": {
-                        "type": "boolean",
-                        "required": False,
-                        "default": False,
-                        "description": "Analyze song mood/sentiment and top words"
-                    },
-                    "metadata": {
-                        "type": "boolean",
-                        "required": False,
-                        "default": False,
-                        "description": "Include song metadata (cover art, duration, genre, etc.)"
-                    },
-                    "fast": {
-                        "type": "boolean",
-                        "required": False,
-                        "default": False,
-                        "description": "Use parallel fetching for faster results"
-                    }
+                "metadata_only": {
+                    "url": "/metadata/",
+                    "method": "GET",
+                    "description": "Get song metadata without lyrics",
+                    "examples": [
+                        "/metadata/?artist=The Beatles&song=Imagine"
+                    ]
+                },
+                "trending": {
+                    "url": "/trending/",
+                    "method": "GET",
+                    "description": "Get trending songs by country",
+                    "examples": [
+                        "/trending/?country=US&limit=20",
+                        "/trending/?country=IN",
+                        "/trending/?countries=US,GB,IN&limit=10"
+                    ]
+                },
+                "top_queries": {
+                    "url": "/analytics/top-queries/",
+                    "method": "GET",
+                    "description": "Get top user queries globally or by country",
+                    "examples": [
+                        "/analytics/top-queries/?limit=20",
+                        "/analytics/top-queries/?country=US&limit=10",
+                        "/analytics/top-queries/?country=US&days=7&limit=15"
+                    ]
+                },
+                "trending_by_country": {
+                    "url": "/analytics/trending-by-country/",
+                    "method": "GET",
+                    "description": "Get top queries for each country",
+                    "examples": [
+                        "/analytics/trending-by-country/?limit=10"
+                    ]
+                },
+                "trending_vs_queries": {
+                    "url": "/analytics/trending-vs-queries/",
+                    "method": "GET",
+                    "description": "Compare trending songs with top user queries",
+                    "examples": [
+                        "/analytics/trending-vs-queries/?country=US&limit=10"
+                    ]
+                },
+                "trending_intersection": {
+                    "url": "/analytics/trending-intersection/",
+                    "method": "GET",
+                    "description": "Find queries that match trending songs",
+                    "examples": [
+                        "/analytics/trending-intersection/?country=US&limit=10"
+                    ]
+                },
+                "jiosaavn_search": {
+                    "url": "/api/jiosaavn/search",
+                    "method": "GET",
+                    "description": "Search for songs on JioSaavn",
+                    "examples": [
+                        "/api/jiosaavn/search?q=Imagine"
+                    ]
+                },
+                "jiosaavn_play": {
+                    "url": "/api/jiosaavn/play",
+                    "method": "GET",
+                    "description": "Get playable stream URL from JioSaavn",
+                    "examples": [
+                        "/api/jiosaavn/play?songLink=<song_link>"
+                    ]
                 },
-                "fetchers": {
-                    "1": "Genius",
-                    "2": "LRCLIB",
-                    "3": "SimpMusic",
-                    "4": "YouTube Music",
-                    "5": "Lyrics.ovh",
-                    "6": "ChartLyrics"
+                "cache_stats": {
+                    "url": "/cache/stats",
+                    "method": "GET",
+                    "description": "Get cache statistics"
+                },
+                "music_app": {
+                    "url": "/app",
+                    "method": "GET",
+                    "description": "Access the web-based music application"
                 }
+            },
+            "parameters": {
+                "artist": {
+                    "type": "string",
+                    "required": True,
+                    "description": "Artist name"
+                },
+                "song": {
+                    "type": "string",
+                    "required": True,
+                    "description": "Song title"
+                },
+                "country": {
+                    "type": "string",
+                    "required": False,
+                    "description": "Country code (US, GB, IN, BR, JP, DE, FR, CA, AU, MX)"
+                },
+                "countries": {
+                    "type": "string",
+                    "required": False,
+                    "description": "Comma-separated country codes"
+                },
+                "limit": {
+                    "type": "integer",
+                    "required": False,
+                    "default": 20,
+                    "description": "Number of results to return"
+                },
+                "days": {
+                    "type": "integer",
+                    "required": False,
+                    "description": "Time window in days for query analytics"
+                },
+                "timestamps": {
+                    "type": "boolean",
+                    "required": False,
+                    "default": False,
+                    "description": "Include synchronized timestamps with lyrics"
+                },
+                "mood": {
+                    "type": "boolean",
+                    "required": False,
+                    "default": False,
+                    "description": "Analyze song mood/sentiment and top words"
+                },
+                "metadata": {
+                    "type": "boolean",
+                    "required": False,
+                    "default": False,
+                    "description": "Include song metadata (cover art, duration, genre, etc.)"
+                },
+                "fast": {
+                    "type": "boolean",
+                    "required": False,
+                    "default": False,
+                    "description": "Use parallel fetching for faster results"
+                }
+            },
+            "fetchers": {
+                "1": "Genius",
+                "2": "LRCLIB",
+                "3": "SimpMusic",
+                "4": "YouTube Music",
+                "5": "Lyrics.ovh",
+                "6": "ChartLyrics"
             }
-        )
+        }
+    )
+
+    @app.route("/")
+    def home():
+        """Main API documentation endpoint"""
+        return Response(home_body, mimetype="application/json", headers={"Cache-Control": "public, max-age=300"})
 
     @app.route("/lyrics/", methods=["GET"])
-    def lyrics():
+    async def lyrics():
         """Fetch lyrics with optional mood analysis and metadata"""
         artist = request.args.get("artist", "").strip()
         song = request.args.get("song", "").strip()
-        country = request.args.get("country", "US").strip().upper()
-        timestamps = (
-            request.args.get("timestamps", "false").lower() == "true"
-            or request.args.get("timestamp", "false").lower() == "true"
-        )
-        pass_param = request.args.get("pass", "false").lower() == "true"
+        country = _country_arg()
+        timestamps = _qbool("timestamps") or _qbool("timestamp")
+        pass_param = _qbool("pass")
         sequence = request.args.get("sequence", None)
-        fast_mode = request.args.get("fast", "false").lower() == "true"
-        analyze_mood = request.args.get("mood", "false").lower() == "true"
-        include_metadata = request.args.get("metadata", "false").lower() == "true"
+        fast_mode = _qbool("fast")
+        analyze_mood = _qbool("mood")
+        include_metadata = _qbool("metadata")
 
         if not artist or not song:
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Artist and song name are required",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                400,
-            )
+            return _err("Artist and song name are required", 400)
 
         if pass_param and not sequence:
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Sequence parameter is required when pass=true",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                400,
-            )
+            return _err("Sequence parameter is required when pass=true", 400)
 
         logger.info(
-            f"Lyrics request: {artist} - {song} (fast={fast_mode}, mood={analyze_mood}, metadata={include_metadata})"
+            "Lyrics request: %s - %s (fast=%s, mood=%s, metadata=%s)", artist, song, fast_mode, analyze_mood, include_metadata
         )
 
-        # Record user query for analytics
+        # Record user query for analytics (written by the background worker)
         try:
-            trending_engine.record_user_query(
-                user_id=request.remote_addr,
-                query=f"{artist} - {song}",
-                country=country
-            )
-        except Exception as e:
-            logger.warning(f"Failed to record user query: {str(e)}")
+            _analytics_q.put_nowait((request.remote_addr, f"{artist} - {song}", country))
+        except queue.Full:
+            logger.warning("Analytics queue full, dropping user query")
 
         # 1. Check Cache First
         cache_key = make_cache_key(artist, song, timestamps, sequence, fast_mode, analyze_mood, include_metadata)
-        cached = load_from_cache(cache_key)
+        cached = load_from_cache_raw(cache_key)
 
         if cached:
-            logger.info(f"Cache hit for {artist} - {song}")
-            return jsonify(cached)
+            # already-serialised JSON: no re-encoding on the hot path
+            logger.info("Cache hit for %s - %s", artist, song)
+            return Response(cached, mimetype="application/json")
 
         # 2. Fetch Fresh Data
         try:
-            result = run_async(
-                fetch_lyrics_controller(
-                    artist,
-                    song,
-                    timestamps=timestamps,
-                    pass_param=pass_param,
-                    sequence=sequence,
-                    fast_mode=fast_mode,
-                ),
-                timeout=60
+            result = await fetch_lyrics_shared(
+                artist,
+                song,
+                timeout=60,
+                timestamps=timestamps,
+                pass_param=pass_param,
+                sequence=sequence,
+                fast_mode=fast_mode,
             )
         except asyncio.TimeoutError:
-            logger.error(f"Timeout fetching lyrics for {artist} - {song}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Request timed out",
-                        "details": "Lyrics fetch took too long",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                504,
-            )
+            logger.error("Timeout fetching lyrics for %s - %s", artist, song)
+            return _err("Request timed out", 504, details="Lyrics fetch took too long")
         except Exception as e:
-            logger.error(f"Error fetching lyrics: {str(e)}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Failed to fetch lyrics",
-                        "details": str(e),
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                500,
-            )
+            logger.error("Error fetching lyrics: %s", e)
+            return _err("Failed to fetch lyrics", 500, details=str(e))
 
         if not isinstance(result, dict):
-            logger.error(f"Invalid result type from fetch_lyrics_controller: {type(result)}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Invalid response from lyrics fetcher",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                500,
-            )
+            logger.error("Invalid result type from fetch_lyrics_controller: %s", type(result))
+            return _err("Invalid response from lyrics fetcher", 500)
 
         # 3. Analyze mood if requested
         if analyze_mood and result.get("status") == "success":
@@ -334,9 +387,9 @@ def register_routes(app):
                         "sentiment": sentiment,
                         "top_words": word_freq,
                     }
-                    logger.info(f"Mood analysis completed for {artist} - {song}")
+                    logger.info("Mood analysis completed for %s - %s", artist, song)
                 except Exception as e:
-                    logger.warning(f"Mood analysis failed: {str(e)}")
+                    logger.warning("Mood analysis failed: %s", e)
                     result["mood_analysis"] = {
                         "error": "Unable to perform mood analysis",
                         "details": str(e),
@@ -348,13 +401,10 @@ def register_routes(app):
         # 4. Include metadata if requested
         if include_metadata and result.get("status") == "success":
             try:
-                metadata_result = enhance_lyrics_with_metadata(result, artist, song)
-                if asyncio.iscoroutine(metadata_result):
-                    metadata_result = run_async(metadata_result, timeout=30)
-                result = metadata_result
-                logger.info(f"Metadata enhanced for {artist} - {song}")
+                result = await run_on_loop(enhance_lyrics_with_metadata(result, artist, song), timeout=30)
+                logger.info("Metadata enhanced for %s - %s", artist, song)
             except Exception as e:
-                logger.warning(f"Metadata enhancement failed: {str(e)}")
+                logger.warning("Metadata enhancement failed: %s", e)
                 result["metadata_error"] = f"Could not retrieve metadata: {str(e)}"
 
         # 5. Cache if successful
@@ -363,151 +413,108 @@ def register_routes(app):
             if data.get("lyrics") or data.get("plain_lyrics") or data.get("lyrics_text"):
                 try:
                     save_to_cache(cache_key, result)
-                    logger.info(f"Result cached for {artist} - {song}")
+                    logger.info("Result cached for %s - %s", artist, song)
                 except Exception as e:
-                    logger.warning(f"Cache save failed: {str(e)}")
+                    logger.warning("Cache save failed: %s", e)
             else:
                 logger.warning(
-                    f"Fetch successful but no lyrics content found for {artist} - {song}. Skipping cache."
+                    "Fetch successful but no lyrics content found for %s - %s. Skipping cache.", artist, song
                 )
 
-        return jsonify(result)
+        return _json(result)
 
     @app.route("/metadata/", methods=["GET"])
-    def metadata():
+    async def metadata():
         """Get song metadata only (without lyrics)"""
         artist = request.args.get("artist", "").strip()
         song = request.args.get("song", "").strip()
 
         if not artist or not song:
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Artist and song name are required",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                400,
-            )
+            return _err("Artist and song name are required", 400)
 
-        logger.info(f"Metadata request for {artist} - {song}")
+        logger.info("Metadata request for %s - %s", artist, song)
         
         try:
-            result = get_metadata_only(artist, song)
-            if asyncio.iscoroutine(result):
-                result = run_async(result, timeout=30)
+            result = await run_on_loop(get_metadata_only(artist, song), timeout=30)
         except asyncio.TimeoutError:
-            logger.error(f"Timeout fetching metadata for {artist} - {song}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Request timed out",
-                        "details": "Metadata fetch took too long",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                504,
-            )
+            logger.error("Timeout fetching metadata for %s - %s", artist, song)
+            return _err("Request timed out", 504, details="Metadata fetch took too long")
         except Exception as e:
-            logger.error(f"Metadata fetch error: {str(e)}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Failed to fetch metadata",
-                        "details": str(e),
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                500,
-            )
+            logger.error("Metadata fetch error: %s", e)
+            return _err("Failed to fetch metadata", 500, details=str(e))
 
-        return jsonify(result)
+        return _json(result)
 
     @app.route("/trending/", methods=["GET"])
     def trending():
         """Get trending songs by country"""
-        country = request.args.get("country", "US").strip().upper()
+        country = _country_arg()
         countries_param = request.args.get("countries", "").strip()
-        limit = request.args.get("limit", 20, type=int)
-
-        if limit < 1 or limit > 100:
-            limit = 20
+        limit = _limit_arg(20)
 
-        logger.info(f"Trending request: country={country}, limit={limit}")
+        logger.info("Trending request: country=%s, limit=%s", country, limit)
 
         try:
             # Handle single country
             if country and not countries_param:
-                try:
-                    country_enum = Country[country]
-                    trending_songs = trending_engine.fetch_trending_songs(country_enum, limit)
-                    
-                    return jsonify({
-                        "status": "success",
-                        "data": {
-                            "country": country,
-                            "trending": [song.to_dict() for song in trending_songs],
-                            "total": len(trending_songs),
-                            "timestamp": datetime.now(timezone.utc).isoformat()
-                        }
-                    })
-                except KeyError:
-                    return jsonify({
-                        "status": "error",
-                        "error": {
-                            "message": f"Invalid country code: {country}",
-                            "valid_countries": [c.value for c in Country],
-                            "timestamp": datetime.now(timezone.utc).isoformat()
-                        }
-                    }), 400
+                country_enum = _COUNTRY_BY_NAME.get(country)
+                if country_enum is None:
+                    return invalid_country_response(country)
+                trending_songs = trending_engine.fetch_trending_songs(country_enum, limit)
+                
+                return _json({
+                    "status": "success",
+                    "data": {
+                        "country": country,
+                        "trending": [song.to_dict() for song in trending_songs],
+                        "total": len(trending_songs),
+                        "timestamp": utcnow_iso()
+                    }
+                })
 
             # Handle multiple countries
             elif countries_param:
-                country_list = [c.strip().upper() for c in countries_param.split(",")]
-                trending_data = {}
+                # unique codes in request order; duplicates would only repeat upstream fetches
+                country_list = list(dict.fromkeys(c.strip().upper() for c in countries_param.split(",") if c.strip()))
+                if len(country_list) > MAX_COUNTRIES:
+                    return _err(f"Too many countries (max {MAX_COUNTRIES})", 400)
+                futures = {}
                 
+                # countries are fetched side by side: total time is the slowest, not the sum
                 for c in country_list:
-                    try:
-                        country_enum = Country[c]
-                        trending_songs = trending_engine.fetch_trending_songs(country_enum, limit)
-                        trending_data[c] = [song.to_dict() for song in trending_songs]
-                    except KeyError:
-                        logger.warning(f"Invalid country code: {c}")
+                    country_enum = _COUNTRY_BY_NAME.get(c)
+                    if country_enum is None:
+                        logger.warning("Invalid country code: %s", c)
                         continue
+                    futures[c] = _trending_pool.submit(trending_engine.fetch_trending_songs, country_enum, limit)
 
-                return jsonify({
+                trending_data = {}
+                for c, future in futures.items():
+                    try:
+                        trending_data[c] = [song.to_dict() for song in future.result(timeout=15)]
+                    except Exception as e:
+                        logger.warning("Trending fetch failed for %s: %s", c, e)
+
+                return _json({
                     "status": "success",
                     "data": {
                         "countries": trending_data,
-                        "timestamp": datetime.now(timezone.utc).isoformat()
+                        "timestamp": utcnow_iso()
                     }
                 })
 
         except Exception as e:
-            logger.error(f"Trending fetch error: {str(e)}")
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Failed to fetch trending data",
-                    "details": str(e),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }), 500
+            logger.error("Trending fetch error: %s", e)
+            return _err("Failed to fetch trending data", 500, details=str(e))
 
     @app.route("/analytics/top-queries/", methods=["GET"])
     def top_queries():
         """Get top user queries globally or by country"""
-        limit = request.args.get("limit", 20, type=int)
-        country = request.args.get("country", "").strip().upper()
+        limit = _limit_arg(20)
+        country = _country_arg("")
         days = request.args.get("days", None, type=int)
 
-        if limit < 1 or limit > 100:
-            limit = 20
-
-        logger.info(f"Top queries request: limit={limit}, country={country}, days={days}")
+        logger.info("Top queries request: limit=%s, country=%s, days=%s", limit, country, days)
 
         try:
             top_q = trending_engine.get_top_queries(
@@ -516,275 +523,147 @@ def register_routes(app):
                 days=days
             )
 
-            return jsonify({
+            return _json({
                 "status": "success",
                 "data": {
                     "scope": "global" if not country else f"country_{country}",
                     "time_window": f"{days} days" if days else "all_time",
                     "top_queries": [{"query": q, "count": c} for q, c in top_q],
                     "total_unique": len(top_q),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
+                    "timestamp": utcnow_iso()
                 }
             })
 
         except Exception as e:
-            logger.error(f"Top queries fetch error: {str(e)}")
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Failed to fetch top queries",
-                    "details": str(e),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }), 500
+            logger.error("Top queries fetch error: %s", e)
+            return _err("Failed to fetch top queries", 500, details=str(e))
 
     @app.route("/analytics/trending-by-country/", methods=["GET"])
     def trending_by_country():
         """Get top queries for each country"""
-        limit = request.args.get("limit", 10, type=int)
-
-        if limit < 1 or limit > 100:
-            limit = 10
+        limit = _limit_arg(10)
 
-        logger.info(f"Trending by country request: limit={limit}")
+        logger.info("Trending by country request: limit=%s", limit)
 
         try:
             top_by_country = trending_engine.get_top_queries_by_country(limit=limit)
+            tail = dumps_json({"total_countries": len(top_by_country), "timestamp": utcnow_iso()})
 
-            return jsonify({
-                "status": "success",
-                "data": {
-                    "countries": {
-                        country: [{"query": q, "count": c} for q, c in queries]
-                        for country, queries in top_by_country.items()
-                    },
-                    "total_countries": len(top_by_country),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            })
+            def generate():
+                # one country per chunk: the first bytes go out before the whole body is encoded
+                yield b'{"status":"success","data":{"countries":{'
+                for i, (country, queries) in enumerate(top_by_country.items()):
+                    yield (b"," if i else b"") + dumps_json(str(country)) + b":" + dumps_json(
+                        [{"query": q, "count": c} for q, c in queries]
+                    )
+                # tail is {"total_countries":..,"timestamp":..}; splice its members in
+                yield b"}," + tail[1:] + b"}"
+
+            return Response(generate(), mimetype="application/json")
 
         except Exception as e:
-            logger.error(f"Trending by country error: {str(e)}")
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Failed to fetch trending by country",
-                    "details": str(e),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }), 500
+            logger.error("Trending by country error: %s", e)
+            return _err("Failed to fetch trending by country", 500, details=str(e))
 
     @app.route("/analytics/trending-vs-queries/", methods=["GET"])
     def trending_vs_queries():
         """Compare trending songs with top user queries"""
-        country = request.args.get("country", "US").strip().upper()
-        limit = request.args.get("limit", 10, type=int)
+        country = _country_arg()
+        limit = _limit_arg(10)
 
-        if limit < 1 or limit > 100:
-            limit = 10
+        logger.info("Trending vs queries request: country=%s, limit=%s", country, limit)
 
-        logger.info(f"Trending vs queries request: country={country}, limit={limit}")
+        country_enum = _COUNTRY_BY_NAME.get(country)
+        if country_enum is None:
+            return invalid_country_response(country)
 
         try:
-            country_enum = Country[country]
             comparison = trending_engine.get_trending_vs_user_queries(country_enum, limit)
 
-            return jsonify({
+            return _json({
                 "status": "success",
                 "data": comparison
             })
 
-        except KeyError:
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": f"Invalid country code: {country}",
-                    "valid_countries": [c.value for c in Country],
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }), 400
         except Exception as e:
-            logger.error(f"Trending vs queries error: {str(e)}")
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Failed to fetch trending vs queries",
-                    "details": str(e),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }), 500
+            logger.error("Trending vs queries error: %s", e)
+            return _err("Failed to fetch trending vs queries", 500, details=str(e))
 
     @app.route("/analytics/trending-intersection/", methods=["GET"])
     def trending_intersection():
         """Find queries that match trending songs"""
-        country = request.args.get("country", "US").strip().upper()
-        limit = request.args.get("limit", 10, type=int)
+        country = _country_arg()
+        limit = _limit_arg(10)
 
-        if limit < 1 or limit > 100:
-            limit = 10
+        logger.info("Trending intersection request: country=%s, limit=%s", country, limit)
 
-        logger.info(f"Trending intersection request: country={country}, limit={limit}")
+        country_enum = _COUNTRY_BY_NAME.get(country)
+        if country_enum is None:
+            return invalid_country_response(country)
 
         try:
-            country_enum = Country[country]
             matches = trending_engine.get_trending_intersection(country_enum, limit)
 
-            return jsonify({
+            return _json({
                 "status": "success",
                 "data": {
                     "country": country,
                     "matches": matches,
                     "total_matches": len(matches),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
+                    "timestamp": utcnow_iso()
                 }
             })
 
-        except KeyError:
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": f"Invalid country code: {country}",
-                    "valid_countries": [c.value for c in Country],
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }), 400
         except Exception as e:
-            logger.error(f"Trending intersection error: {str(e)}")
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Failed to fetch trending intersection",
-                    "details": str(e),
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }), 500
+            logger.error("Trending intersection error: %s", e)
+            return _err("Failed to fetch trending intersection", 500, details=str(e))
 
     @app.route("/api/jiosaavn/search", methods=["GET"])
-    def jiosaavn_search():
+    async def jiosaavn_search():
         """Search for songs on JioSaavn"""
         query = request.args.get("q", "").strip()
         
         if not query:
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Query parameter 'q' is required",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                400,
-            )
+            return _err("Query parameter 'q' is required", 400)
 
-        logger.info(f"JioSaavn search query: {query}")
+        logger.info("JioSaavn search query: %s", query)
         
         try:
-            results = search_jiosaavn(query)
-            if asyncio.iscoroutine(results):
-                results = run_async(results, timeout=30)
-            return jsonify({"status": "success", "results": results})
+            results = await run_on_loop(search_jiosaavn(query), timeout=30)
+            return _json({"status": "success", "results": results})
         except asyncio.TimeoutError:
-            logger.error(f"Timeout searching JioSaavn for: {query}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Request timed out",
-                        "details": "JioSaavn search took too long",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                504,
-            )
+            logger.error("Timeout searching JioSaavn for: %s", query)
+            return _err("Request timed out", 504, details="JioSaavn search took too long")
         except Exception as e:
-            logger.error(f"JioSaavn search error: {str(e)}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Failed to search JioSaavn",
-                        "details": str(e),
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                500,
-            )
+            logger.error("JioSaavn search error: %s", e)
+            return _err("Failed to search JioSaavn", 500, details=str(e))
 
     @app.route("/api/jiosaavn/play", methods=["GET"])
-    def jiosaavn_play():
+    async def jiosaavn_play():
         """Get playable stream URL from JioSaavn"""
         song_link = request.args.get("songLink", "").strip()
         
         if not song_link:
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "songLink parameter is required",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                400,
-            )
+            return _err("songLink parameter is required", 400)
 
-        logger.info(f"JioSaavn play request for: {song_link}")
+        logger.info("JioSaavn play request for: %s", song_link)
         
         try:
-            data = get_jiosaavn_stream(song_link)
-            if asyncio.iscoroutine(data):
-                data = run_async(data, timeout=30)
+            data = await run_on_loop(get_jiosaavn_stream(song_link), timeout=30)
             
             if not data or not isinstance(data, dict):
-                return (
-                    jsonify({
-                        "status": "error",
-                        "error": {
-                            "message": "Invalid response from JioSaavn",
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        },
-                    }),
-                    500,
-                )
+                return _err("Invalid response from JioSaavn", 500)
 
             if not data.get("stream_url"):
-                return (
-                    jsonify({
-                        "status": "error",
-                        "error": {
-                            "message": "Unable to fetch stream URL",
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        },
-                    }),
-                    500,
-                )
+                return _err("Unable to fetch stream URL", 500)
 
-            return jsonify({"status": "success", "data": data})
+            return _json({"status": "success", "data": data})
         except asyncio.TimeoutError:
-            logger.error(f"Timeout fetching stream for: {song_link}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Request timed out",
-                        "details": "Stream fetch took too long",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                504,
-            )
+            logger.error("Timeout fetching stream for: %s", song_link)
+            return _err("Request timed out", 504, details="Stream fetch took too long")
         except Exception as e:
-            logger.error(f"JioSaavn play error: {str(e)}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Failed to fetch stream",
-                        "details": str(e),
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                500,
-            )
+            logger.error("JioSaavn play error: %s", e)
+            return _err("Failed to fetch stream", 500, details=str(e))
 
     @app.route("/app", methods=["GET"])
     def app_page():
@@ -792,34 +671,18 @@ def register_routes(app):
         try:
             return render_template("index.html")
         except Exception as e:
-            logger.error(f"Failed to render app page: {str(e)}")
-            return jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Failed to load application",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-            }), 500
+            logger.error("Failed to render app page: %s", e)
+            return _err("Failed to load application", 500)
 
     @app.route("/cache/stats", methods=["GET"])
     def route_cache_stats():
         """Get cache statistics and information"""
         try:
             stats = cache_stats()
-            return jsonify({"status": "success", **stats})
+            return _json({"status": "success", **stats})
         except Exception as e:
-            logger.error(f"Cache stats error: {str(e)}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Failed to retrieve cache stats",
-                        "details": str(e),
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                500,
-            )
+            logger.error("Cache stats error: %s", e)
+            return _err("Failed to retrieve cache stats", 500, details=str(e))
 
     @app.route("/cache/clear", methods=["POST"])
     def route_clear_cache():
@@ -827,20 +690,10 @@ def register_routes(app):
         try:
             res = clear_cache()
             logger.info("Cache cleared")
-            return jsonify({"status": "success", "details": res})
+            return _json({"status": "success", "details": res})
         except Exception as e:
-            logger.error(f"Cache clear error: {str(e)}")
-            return (
-                jsonify({
-                    "status": "error",
-                    "error": {
-                        "message": "Failed to clear cache",
-                        "details": str(e),
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                }),
-                500,
-            )
+            logger.error("Cache clear error: %s", e)
+            return _err("Failed to clear cache", 500, details=str(e))
 
     @app.route("/favicon.ico", methods=["GET"])
     def favicon():
@@ -850,31 +703,13 @@ def register_routes(app):
     @app.errorhandler(404)
     def not_found(error):
         """Handle 404 errors"""
-        return (
-            jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Endpoint not found",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-            }),
-            404,
-        )
+        return _err("Endpoint not found", 404)
 
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors"""
-        logger.error(f"Internal server error: {str(error)}")
-        return (
-            jsonify({
-                "status": "error",
-                "error": {
-                    "message": "Internal server error",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-            }),
-            500,
-        )
+        logger.error("Internal server error: %s", error)
+        return _err("Internal server error", 500)
 
 '''
  @app.route("/debug/trending-raw", methods=["GET"])
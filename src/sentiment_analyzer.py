@@ -1,9 +1,17 @@
+import bisect
+import functools
+from collections import Counter
 from textblob import TextBlob
+from textblob.en.sentiments import PatternAnalyzer
 from src.logger import get_logger
 from typing import Optional
 
 logger = get_logger("sentiment_analyzer")
 
+# TextBlob(text).sentiment is exactly this analyzer run on the raw text; calling it
+# directly skips building a TextBlob (tokenizer, tagger, parser setup) per call
+_SENTIMENT = PatternAnalyzer()
+
 def extract_lyrics_text(result: dict) -> str:
     """
     Extract lyrics text from different fetcher formats.
@@ -29,6 +37,23 @@ def extract_lyrics_text(result: dict) -> str:
     
     return str(lyrics_text).strip()
 
+# Bands are "value > threshold"; labels are indexed by how many thresholds the value exceeds
+_STRENGTH_BINS = (0.25, 0.5, 0.7)
+_STRENGTH_LABELS = ("Weak", "Moderate", "Strong", "Very Strong")
+
+_POL_BINS = (-0.5, -0.25, -0.1, 0.1, 0.25, 0.5)
+_SUBJ_BINS = (0.3, 0.6)
+# rows: polarity band (most negative first); columns: subjectivity <= 0.3, <= 0.6, > 0.6
+_MOOD_TABLE = (
+    ("Very Negative & Harsh", "Angry & Intense", "Very Sad & Emotional"),
+    ("Dark", "Melancholic", "Sad & Emotional"),
+    ("Mildly Negative",) * 3,
+    ("Neutral & Objective", "Matter-of-fact", "Introspective & Neutral"),
+    ("Mildly Positive",) * 3,
+    ("Optimistic", "Cheerful", "Joyful & Personal"),
+    ("Uplifting & Positive", "Happy & Expressive", "Very Happy & Emotional"),
+)
+
 def analyze_sentiment(lyrics_text: str) -> dict:
     """
     Analyze sentiment/mood of lyrics using TextBlob.
@@ -53,9 +78,9 @@ def analyze_sentiment(lyrics_text: str) -> dict:
         }
     
     try:
-        blob = TextBlob(lyrics_text)
-        polarity = blob.sentiment.polarity  # -1 (negative) to 1 (positive)
-        subjectivity = blob.sentiment.subjectivity  # 0 (objective) to 1 (subjective)
+        sentiment = _SENTIMENT.analyze(lyrics_text)
+        polarity = sentiment.polarity  # -1 (negative) to 1 (positive)
+        subjectivity = sentiment.subjectivity  # 0 (objective) to 1 (subjective)
         
         # Determine mood based on polarity
         if polarity > 0.1:
@@ -66,15 +91,7 @@ def analyze_sentiment(lyrics_text: str) -> dict:
             mood = "Neutral"
         
         # Determine mood strength based on absolute polarity
-        abs_polarity = abs(polarity)
-        if abs_polarity > 0.7:
-            mood_strength = "Very Strong"
-        elif abs_polarity > 0.5:
-            mood_strength = "Strong"
-        elif abs_polarity > 0.25:
-            mood_strength = "Moderate"
-        else:
-            mood_strength = "Weak"
+        mood_strength = _STRENGTH_LABELS[bisect.bisect_left(_STRENGTH_BINS, abs(polarity))]
         
         # Generate descriptive overall mood
         overall_mood = generate_mood_description(polarity, subjectivity)
@@ -104,52 +121,13 @@ def generate_mood_description(polarity: float, subjectivity: float) -> str:
     Generate a descriptive mood label based on polarity and subjectivity.
     """
     
-    # Mood mapping based on polarity and subjectivity
-    if polarity > 0.5:
-        if subjectivity > 0.6:
-            return "Very Happy & Emotional"
-        elif subjectivity > 0.3:
-            return "Happy & Expressive"
-        else:
-            return "Uplifting & Positive"
-    
-    elif polarity > 0.25:
-        if subjectivity > 0.6:
-            return "Joyful & Personal"
-        elif subjectivity > 0.3:
-            return "Cheerful"
-        else:
-            return "Optimistic"
-    
-    elif polarity > 0.1:
-        return "Mildly Positive"
-    
-    elif polarity > -0.1:
-        if subjectivity > 0.6:
-            return "Introspective & Neutral"
-        elif subjectivity > 0.3:
-            return "Matter-of-fact"
-        else:
-            return "Neutral & Objective"
-    
-    elif polarity > -0.25:
-        return "Mildly Negative"
-    
-    elif polarity > -0.5:
-        if subjectivity > 0.6:
-            return "Sad & Emotional"
-        elif subjectivity > 0.3:
-            return "Melancholic"
-        else:
-            return "Dark"
-    
-    else:
-        if subjectivity > 0.6:
-            return "Very Sad & Emotional"
-        elif subjectivity > 0.3:
-            return "Angry & Intense"
-        else:
-            return "Very Negative & Harsh"
+    # bisect_left counts thresholds strictly below the value, matching the "> threshold" bands
+    return _MOOD_TABLE[bisect.bisect_left(_POL_BINS, polarity)][bisect.bisect_left(_SUBJ_BINS, subjectivity)]
+
+@functools.lru_cache(maxsize=50_000)
+def _word_polarity(word: str) -> float:
+    # vocabulary is small and repeats across songs, so each word is scored once per process
+    return _SENTIMENT.analyze(word).polarity
 
 def analyze_word_frequency(lyrics_text: str, top_n: int = 10) -> dict:
     """
@@ -167,23 +145,23 @@ def analyze_word_frequency(lyrics_text: str, top_n: int = 10) -> dict:
     
     try:
         blob = TextBlob(lyrics_text)
-        words = [word.lower() for word, pos in blob.tags if pos == 'NN' or pos == 'JJ']
+        counts = Counter(word.lower() for word, pos in blob.tags if pos == 'NN' or pos == 'JJ')
         
-        positive_words = {}
-        negative_words = {}
+        positive_words = Counter()
+        negative_words = Counter()
         
-        for word in words:
-            word_blob = TextBlob(word)
-            polarity = word_blob.sentiment.polarity
+        # score each distinct word once; repeats (choruses) only add to its count
+        for word, count in counts.items():
+            polarity = _word_polarity(word)
             
             if polarity > 0.1:
-                positive_words[word] = positive_words.get(word, 0) + 1
+                positive_words[word] = count
             elif polarity < -0.1:
-                negative_words[word] = negative_words.get(word, 0) + 1
+                negative_words[word] = count
         
         # Sort and get top N
-        top_positive = sorted(positive_words.items(), key=lambda x: x[1], reverse=True)[:top_n]
-        top_negative = sorted(negative_words.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        top_positive = positive_words.most_common(top_n)
+        top_negative = negative_words.most_common(top_n)
         
         return {
             "positive_words": [{"word": w, "frequency": f} for w, f in top_positive],
@@ -1,5 +1,59 @@
+import asyncio
+from collections import defaultdict
+import httpx
+
+# Upper bound on concurrent requests to any one upstream host
+PER_HOST_CONCURRENCY = 8
+
+
+class _PerHostLimitedTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Per transport, i.e. per client: a client (and so its semaphores) is only ever
+        # used from the event loop that created it, while a module-level table would be
+        # shared by the app loop and the legacy router's loop
+        self._host_sem = defaultdict(lambda: asyncio.Semaphore(PER_HOST_CONCURRENCY))
+
+    async def handle_async_request(self, request):
+        async with self._host_sem[request.url.host]:
+            return await super().handle_async_request(request)
+
+
+def create_shared_client() -> httpx.AsyncClient:
+    """Build the HTTP client shared by every fetcher (one connection pool for all upstreams)"""
+    return httpx.AsyncClient(
+        transport=_PerHostLimitedTransport(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        ),
+        # no pool timeout: waiting for a connection under load isn't a slow upstream, and
+        # fetch_controller already bounds each whole fetch with async_timeout
+        timeout=httpx.Timeout(8.0, pool=None)
+    )
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """The shared client, created on first use; this module owns it"""
+    if BaseFetcher.http_client is None:
+        BaseFetcher.http_client = create_shared_client()
+    return BaseFetcher.http_client
+
+
+async def close_shared_client():
+    """Close the shared client; the next get_shared_client() builds a fresh one"""
+    client, BaseFetcher.http_client = BaseFetcher.http_client, None
+    if client is not None:
+        await client.aclose()
+
+
 class BaseFetcher:
     """Abstract base fetcher class - implements common interface."""
+    # Created by get_shared_client(), closed by close_shared_client()
+    http_client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        return get_shared_client()
+
     def fetch(self, artist: str, song: str, timestamps: bool=False):
         """
         Fetch lyrics.
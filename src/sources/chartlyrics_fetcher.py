@@ -1,29 +1,30 @@
-import httpx
+import asyncio
+try:
+    from asyncio import timeout as async_timeout  # Python 3.11+
+except ImportError:
+    from async_timeout import timeout as async_timeout
 import xml.etree.ElementTree as ET
-from datetime import datetime, timezone
 from src.logger import get_logger
+from src.utils import utcnow_str
 from .base_fetcher import BaseFetcher
 
 logger = get_logger("chartlyrics_fetcher")
 
+# Per call, pool wait included (the shared client has no pool timeout); under
+# fetch_controller's 10s bound so a stuck call is logged here as a miss
+REQUEST_TIMEOUT = 8  # seconds
+
 class ChartLyricsFetcher(BaseFetcher):
-    def __init__(self):
-        self.client = None
-    
-    async def _get_client(self):
-        if self.client is None:
-            self.client = httpx.AsyncClient(timeout=10.0)
-        return self.client
-    
     async def fetch(self, artist: str, song: str, timestamps: bool = False):
         """Async fetch from ChartLyrics API"""
         try:
             logger.info(f"Attempting ChartLyrics for {artist} - {song}")
             
-            client = await self._get_client()
+            client = self._get_client()
             url = f"http://api.chartlyrics.com/apiv1.asmx/SearchLyricDirect?artist={artist}&song={song}"
             
-            response = await client.get(url)
+            async with async_timeout(REQUEST_TIMEOUT):
+                response = await client.get(url)
             
             if response.status_code == 200 and "<Lyric>" in response.text:
                 try:
@@ -36,7 +37,7 @@ class ChartLyricsFetcher(BaseFetcher):
                             "artist": artist,
                             "title": song,
                             "lyrics": lyric,
-                            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                            "timestamp": utcnow_str()
                         }
                 except ET.ParseError as e:
                     logger.error(f"XML parsing error: {e}")
@@ -44,11 +45,10 @@ class ChartLyricsFetcher(BaseFetcher):
             
             return None
         
+        except asyncio.TimeoutError:
+            # a slow upstream is a miss, not a failure
+            logger.info(f"ChartLyrics timed out for {artist} - {song}")
+            return None
         except Exception as e:
             logger.error(f"ChartLyrics error: {e}")
             return None
-    
-    async def close(self):
-        """Close the async client"""
-        if self.client:
-            await self.client.aclose()
\ No newline at end of file
@@ -4,6 +4,7 @@ Async Fetcher Manager - handles lifecycle of fetcher instances
 import asyncio
 from typing import Dict
 from src.logger import get_logger
+from src.sources.base_fetcher import get_shared_client, close_shared_client
 
 logger = get_logger("fetcher_manager")
 
@@ -20,18 +21,27 @@ class AsyncFetcherManager:
             cls._instance.initialized = False
         return cls._instance
     
+    @property
+    def http_client(self):
+        """The httpx.AsyncClient shared by every HTTP fetcher"""
+        return get_shared_client()
+    
     async def register_fetcher(self, name: str, fetcher_instance):
         """Register a fetcher instance"""
         async with self._lock:
             self.fetchers[name] = fetcher_instance
             logger.info(f"Registered fetcher: {name}")
     
-    async def get_fetcher(self, name: str):
-        """Get a fetcher instance"""
-        if name not in self.fetchers:
+    def get_fetcher(self, name: str):
+        """Get a fetcher instance
+
+        Plain dict read - registration happens once at startup, so lookups on
+        the request path need neither the lock nor a coroutine.
+        """
+        fetcher = self.fetchers.get(name)
+        if fetcher is None:
             logger.warning(f"Fetcher not found: {name}")
-            return None
-        return self.fetchers[name]
+        return fetcher
     
     async def close_all(self):
         """Close all fetcher instances and clean up resources"""
@@ -59,6 +69,9 @@ fetcher_manager = AsyncFetcherManager()
 async def initialize_fetchers():
     """Initialize all fetchers (call this on app startup)"""
     try:
+        # build the shared client up front rather than on the first request
+        get_shared_client()
+
         from src.sources.genius_fetcher import GeniusFetcher
         from src.sources.lrclib_fetcher import LRCLIBFetcher
         from src.sources.simp_music_fetcher import SimpMusicFetcher
@@ -83,5 +96,6 @@ async def initialize_fetchers():
 
 
 async def cleanup_fetchers():
-    """Clean up all fetchers (call this on app shutdown)"""
+    """Clean up all fetchers and the shared HTTP client (call this on app shutdown)"""
     await fetcher_manager.close_all()
+    await close_shared_client()
@@ -1,7 +1,7 @@
 import asyncio
-from datetime import datetime, timezone
 from src.config import GENIUS_TOKEN
 from src.logger import get_logger
+from src.utils import utcnow_str
 from .base_fetcher import BaseFetcher
 from lyricsgenius import Genius
 
@@ -37,7 +37,7 @@ class GeniusFetcher(BaseFetcher):
             if not genius:
                 return None
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             g_song = await loop.run_in_executor(
                 None,
                 lambda: genius.search_song(song, artist)
@@ -49,7 +49,7 @@ class GeniusFetcher(BaseFetcher):
                     "artist": g_song.artist,
                     "title": g_song.title,
                     "lyrics": g_song.lyrics,
-                    "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                    "timestamp": utcnow_str()
                 }
             
             return None
@@ -1,19 +1,88 @@
+import asyncio
 import logging
+from collections import OrderedDict
+from time import time
 from typing import List, Dict, Any
 
-import requests
+try:
+    from asyncio import timeout as async_timeout  # Python 3.11+
+except ImportError:
+    from async_timeout import timeout as async_timeout
+
+from .base_fetcher import get_shared_client
 
 logger = logging.getLogger("jiosaavn_fetcher")
 
 BASE_URL = "https://saavnapi-nine.vercel.app"
+REQUEST_TIMEOUT = 10  # seconds, per call
+
+# Responses rarely change; stream (media) URLs are signed and expire sooner
+SEARCH_CACHE_TTL = 3600  # seconds
+STREAM_CACHE_TTL = 600  # seconds
+CACHE_SIZE = 10000
+
+# key -> (expiry, result), in least-recently-used order
+_search_cache = OrderedDict()
+_stream_cache = OrderedDict()
+
+# Lookups in flight, keyed like the caches, so concurrent callers share one request
+_inflight = {}
+
+
+def _cache_get(cache: OrderedDict, key):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if time() > entry[0]:
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return entry[1]
+
+
+def _cache_put(cache: OrderedDict, key, result, ttl: int):
+    cache[key] = (time() + ttl, result)
+    cache.move_to_end(key)
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+async def _cached(cache: OrderedDict, key, ttl: int, fetch, is_hit):
+    result = _cache_get(cache, key)
+    if result is not None:
+        return result
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    result = await asyncio.shield(task)
+    # failures come back as empty results; those are retried, not cached
+    if is_hit(result):
+        _cache_put(cache, key, result, ttl)
+    return result
+
+
+async def search_jiosaavn(query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    return await _cached(
+        _search_cache, ("search", query.strip().lower(), limit), SEARCH_CACHE_TTL,
+        lambda: _search_jiosaavn(query, limit), bool
+    )
+
 
+async def get_jiosaavn_stream(song_link: str) -> Dict[str, Any]:
+    return await _cached(
+        _stream_cache, ("stream", song_link), STREAM_CACHE_TTL,
+        lambda: _get_jiosaavn_stream(song_link), lambda r: bool(r.get("stream_url"))
+    )
 
 
-def search_jiosaavn(query: str, limit: int = 20) -> List[Dict[str, Any]]:
+async def _search_jiosaavn(query: str, limit: int = 20) -> List[Dict[str, Any]]:
     try:
-        url = f"{BASE_URL}/result/?query={requests.utils.quote(query)}&lyrics=false"
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
+        async with async_timeout(REQUEST_TIMEOUT):
+            resp = await get_shared_client().get(f"{BASE_URL}/result/", params={"query": query, "lyrics": "false"})
+            resp.raise_for_status()
         data = resp.json()
 
         songs: List[Dict[str, Any]] = []
@@ -66,7 +135,7 @@ def search_jiosaavn(query: str, limit: int = 20) -> List[Dict[str, Any]]:
 
 
 
-def get_jiosaavn_stream(song_link: str) -> Dict[str, Any]:
+async def _get_jiosaavn_stream(song_link: str) -> Dict[str, Any]:
     """
     Get streaming info for a JioSaavn song using /song endpoint.
 
@@ -95,9 +164,9 @@ def get_jiosaavn_stream(song_link: str) -> Dict[str, Any]:
 
         # Your working example:
         # https://saavnapi-nine.vercel.app/song/?query=https://www.jiosaavn.com/song/khairiyat/PwAFSRNpAWw&lyrics=false
-        url = f"{BASE_URL}/song/?query={song_link}&lyrics=false"
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
+        async with async_timeout(REQUEST_TIMEOUT):
+            resp = await get_shared_client().get(f"{BASE_URL}/song/", params={"query": song_link, "lyrics": "false"})
+            resp.raise_for_status()
         song_info = resp.json()  # returns a single dict (no "data" wrapper)
 
         if not isinstance(song_info, dict):
@@ -1,32 +1,33 @@
 import re
-from datetime import datetime, timezone
-import httpx
+import asyncio
+try:
+    from asyncio import timeout as async_timeout  # Python 3.11+
+except ImportError:
+    from async_timeout import timeout as async_timeout
 from src.config import LRCLIB_API_URL
 from src.logger import get_logger
+from src.utils import utcnow_str
 from .base_fetcher import BaseFetcher
 
 logger = get_logger("lrclib_fetcher")
 
+# Per call, pool wait included (the shared client has no pool timeout); under
+# fetch_controller's 10s bound so a stuck call is logged here as a miss
+REQUEST_TIMEOUT = 8  # seconds
+
 class LRCLIBFetcher(BaseFetcher):
-    def __init__(self):
-        self.client = None
-    
-    async def _get_client(self):
-        if self.client is None:
-            self.client = httpx.AsyncClient(timeout=10.0)
-        return self.client
-    
     async def fetch(self, artist: str, song: str, timestamps: bool = True):
         """Async fetch from LRCLIB API"""
         try:
             logger.info(f"Attempting LRCLIB API for {artist} - {song}")
-            client = await self._get_client()
+            client = self._get_client()
             
             # Search for track
             search_url = "https://lrclib.net/api/search"
             params = {"track_name": song, "artist_name": artist}
             
-            search_resp = await client.get(search_url, params=params)
+            async with async_timeout(REQUEST_TIMEOUT):
+                search_resp = await client.get(search_url, params=params)
             if search_resp.status_code != 200:
                 return None
             
@@ -44,7 +45,8 @@ class LRCLIBFetcher(BaseFetcher):
                 "duration": track.get("duration")
             }
             
-            get_resp = await client.get(LRCLIB_API_URL, params=get_params)
+            async with async_timeout(REQUEST_TIMEOUT):
+                get_resp = await client.get(LRCLIB_API_URL, params=get_params)
             if get_resp.status_code != 200:
                 return None
             
@@ -62,7 +64,7 @@ class LRCLIBFetcher(BaseFetcher):
                 "duration": data.get("duration"),
                 "instrumental": data.get("instrumental", False),
                 "lyrics": lyrics,
-                "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": utcnow_str()
             }
             
             # Parse timed lyrics if timestamps requested
@@ -108,11 +110,10 @@ class LRCLIBFetcher(BaseFetcher):
             
             return result
         
+        except asyncio.TimeoutError:
+            # a slow upstream is a miss, not a failure
+            logger.info(f"LRCLIB API timed out for {artist} - {song}")
+            return None
         except Exception as e:
             logger.error(f"LRCLIB API error: {e}")
             return None
-    
-    async def close(self):
-        """Close the async client"""
-        if self.client:
-            await self.client.aclose()
\ No newline at end of file
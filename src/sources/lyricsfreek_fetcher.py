@@ -1,24 +1,14 @@
 import re
-import httpx
 from bs4 import BeautifulSoup
-from datetime import datetime, timezone
 from src.logger import get_logger
+from src.utils import utcnow_str
 from .base_fetcher import BaseFetcher
 
 logger = get_logger("lyricsfreek_fetcher")
 
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; LyricsFetcher/1.0)"}
+
 class LyricsFreekFetcher(BaseFetcher):
-    def __init__(self):
-        self.client = None
-    
-    async def _get_client(self):
-        if self.client is None:
-            self.client = httpx.AsyncClient(
-                timeout=10.0,
-                headers={"User-Agent": "Mozilla/5.0 (compatible; LyricsFetcher/1.0)"}
-            )
-        return self.client
-    
     async def fetch(self, artist: str, song: str, timestamps: bool = False):
         """Async fetch from LyricsFreek"""
         try:
@@ -28,8 +18,8 @@ class LyricsFreekFetcher(BaseFetcher):
             search_title = song.lower().replace(" ", "-")
             url = f"https://www.lyricsfreek.com/{search_artist}/{search_title}-lyrics"
             
-            client = await self._get_client()
-            response = await client.get(url, follow_redirects=True)
+            client = self._get_client()
+            response = await client.get(url, headers=HEADERS, follow_redirects=True)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, "html.parser")
@@ -51,7 +41,7 @@ class LyricsFreekFetcher(BaseFetcher):
                             "artist": artist,
                             "title": song,
                             "lyrics": lyrics,
-                            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                            "timestamp": utcnow_str()
                         }
             
             return None
@@ -59,8 +49,3 @@ class LyricsFreekFetcher(BaseFetcher):
         except Exception as e:
             logger.error(f"LyricsFreek error: {e}")
             return None
-    
-    async def close(self):
-        """Close the async client"""
-        if self.client:
-            await self.client.aclose()
\ No newline at end of file
@@ -1,25 +1,16 @@
-import httpx
-from datetime import datetime, timezone
 from src.logger import get_logger
+from src.utils import utcnow_str
 from .base_fetcher import BaseFetcher
 
 logger = get_logger("lyricsovh_fetcher")
 
 class LyricsOvhFetcher(BaseFetcher):
-    def __init__(self):
-        self.client = None
-    
-    async def _get_client(self):
-        if self.client is None:
-            self.client = httpx.AsyncClient(timeout=10.0)
-        return self.client
-    
     async def fetch(self, artist: str, song: str, timestamps: bool = False):
         """Async fetch from Lyrics.ovh API"""
         try:
             logger.info(f"Attempting Lyrics.ovh API for {artist} - {song}")
             
-            client = await self._get_client()
+            client = self._get_client()
             url = f"https://api.lyrics.ovh/v1/{artist}/{song}"
             
             response = await client.get(url)
@@ -32,7 +23,7 @@ class LyricsOvhFetcher(BaseFetcher):
                         "artist": artist,
                         "title": song,
                         "lyrics": data["lyrics"],
-                        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                        "timestamp": utcnow_str()
                     }
             
             return None
@@ -40,8 +31,3 @@ class LyricsOvhFetcher(BaseFetcher):
         except Exception as e:
             logger.error(f"Lyrics.ovh error: {e}")
             return None
-    
-    async def close(self):
-        """Close the async client"""
-        if self.client:
-            await self.client.aclose()
\ No newline at end of file
@@ -1,7 +1,6 @@
 import re
-import httpx
-from datetime import datetime, timezone
 from src.logger import get_logger
+from src.utils import utcnow_str
 from .base_fetcher import BaseFetcher
 
 logger = get_logger("simpmusic_fetcher")
@@ -9,18 +8,10 @@ logger = get_logger("simpmusic_fetcher")
 API_BASE = "https://api-lyrics.simpmusic.org/v1"
 
 class SimpMusicFetcher(BaseFetcher):
-    def __init__(self):
-        self.client = None
-    
-    async def _get_client(self):
-        if self.client is None:
-            self.client = httpx.AsyncClient(timeout=10.0)
-        return self.client
-    
     async def search_song(self, title: str, artist: str = None):
         """Async search for song"""
         try:
-            client = await self._get_client()
+            client = self._get_client()
             params = {"q": title}
             resp = await client.get(f"{API_BASE}/search", params=params)
             resp.raise_for_status()
@@ -32,7 +23,7 @@ class SimpMusicFetcher(BaseFetcher):
     async def get_lyrics(self, video_id: str):
         """Async fetch lyrics by video ID"""
         try:
-            client = await self._get_client()
+            client = self._get_client()
             resp = await client.get(f"{API_BASE}/{video_id}")
             resp.raise_for_status()
             return resp.json()
@@ -76,7 +67,7 @@ class SimpMusicFetcher(BaseFetcher):
                 "title": first.get("title") or song,
                 "lyrics": d.get("plainLyrics") or d.get("lyrics") or None,
                 "timestamped": d.get("syncedLyrics") or d.get("lrc") or None,
-                "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": utcnow_str()
             }
             
             # Parse timed lyrics if timestamps requested
@@ -111,8 +102,3 @@ class SimpMusicFetcher(BaseFetcher):
         except Exception as e:
             logger.error(f"SimpMusic fetch error: {e}")
             return None
-    
-    async def close(self):
-        """Close the async client"""
-        if self.client:
-            await self.client.aclose()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import asyncio
-from datetime import datetime, timezone
 from ytmusicapi import YTMusic
 from src.logger import get_logger
+from src.utils import utcnow_str
 from .base_fetcher import BaseFetcher
 
 logger = get_logger("youtube_fetcher")
@@ -26,7 +26,7 @@ class YoutubeFetcher(BaseFetcher):
             
             # Search for song
             search_query = f"{song} {artist}"
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             search_results = await loop.run_in_executor(
                 None,
                 lambda: ytmusic.search(query=search_query, filter="songs", limit=1)
@@ -81,7 +81,7 @@ class YoutubeFetcher(BaseFetcher):
                 "lyrics": "\n".join(
                     line.text for line in lyrics_data["lyrics"]
                 ) if hasattr(lyrics_data["lyrics"][0], "text") else lyrics_data["lyrics"],
-                "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": utcnow_str()
             }
             
             if timed_lyrics:
@@ -5,6 +5,7 @@ import json
 from enum import Enum
 import asyncio
 import os
+import threading
 import requests
 import logging
 
@@ -103,6 +104,9 @@ class TrendingAnalyticsEngine:
         self.user_queries = []
         self.query_cache = defaultdict(int)  # {query: count}
         self.country_query_cache = defaultdict(lambda: defaultdict(int))  # {country: {query: count}}
+        # Readers run in worker threads while queries are recorded elsewhere;
+        # guards user_queries, query_cache and country_query_cache
+        self._query_lock = threading.Lock()
         
         # Apple Music API Base URL
         self.apple_music_base_url = "https://rss.applemarketingtools.com/api/v2"
@@ -215,6 +219,11 @@ class TrendingAnalyticsEngine:
             query: The search query
             country: Country code (ISO 3166-1 alpha-2)
         """
+        with self._query_lock:
+            self._record_user_query(user_id, query, country)
+    
+    def _record_user_query(self, user_id: str, query: str, country: str) -> None:
+        """Record one query; the caller holds _query_lock"""
         try:
             user_query = UserQuery(user_id, query, country.upper())
             self.user_queries.append(user_query)
@@ -229,6 +238,18 @@ class TrendingAnalyticsEngine:
         except Exception as e:
             logger.error(f"Error recording user query: {str(e)}")
     
+    def record_user_queries_batch(self, batch: List[Tuple[str, str, str]]) -> None:
+        """
+        Record many user queries at once.
+        
+        Args:
+            batch: (user_id, query, country) tuples
+        """
+        with self._query_lock:
+            for user_id, query, country in batch:
+                self._record_user_query(user_id, query, country)
+        logger.debug(f"Recorded batch of {len(batch)} queries")
+    
     def get_top_queries(self, limit: int = 20, country: Optional[str] = None,
                        days: Optional[int] = None) -> List[Tuple[str, int]]:
         """
@@ -245,17 +266,18 @@ class TrendingAnalyticsEngine:
         if limit < 1 or limit > 100:
             limit = 20
         
-        if country:
-            queries_to_analyze = self.country_query_cache.get(country.upper(), {}).copy()
-        else:
-            queries_to_analyze = self.query_cache.copy()
-        
-        # Filter by time window if specified
-        if days:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            queries_to_analyze = self._filter_queries_by_date(
-                queries_to_analyze, cutoff_date
-            )
+        with self._query_lock:
+            if country:
+                queries_to_analyze = self.country_query_cache.get(country.upper(), {}).copy()
+            else:
+                queries_to_analyze = self.query_cache.copy()
+            
+            # Filter by time window if specified
+            if days:
+                cutoff_date = datetime.now() - timedelta(days=days)
+                queries_to_analyze = self._filter_queries_by_date(
+                    queries_to_analyze, cutoff_date
+                )
         
         # Sort by frequency and return top N
         top_queries = sorted(queries_to_analyze.items(), key=lambda x: x[1], 
@@ -277,10 +299,14 @@ class TrendingAnalyticsEngine:
         if limit < 1 or limit > 100:
             limit = 20
         
+        # Snapshot under the lock, sort outside it
+        with self._query_lock:
+            snapshot = {country: list(counts.items()) for country, counts in self.country_query_cache.items()}
+        
         results = {}
-        for country in self.country_query_cache:
+        for country, items in snapshot.items():
             results[country] = sorted(
-                self.country_query_cache[country].items(),
+                items,
                 key=lambda x: x[1],
                 reverse=True
             )[:limit]
@@ -565,7 +591,7 @@ class TrendingAnalyticsEngine:
             return []
     
     def _filter_queries_by_date(self, queries: Dict, cutoff_date: datetime) -> Dict:
-        """Filter queries to only include those after cutoff date"""
+        """Filter queries to only include those after cutoff date (caller holds _query_lock)"""
         filtered = {}
         
         for query_obj in self.user_queries:
@@ -1,9 +1,42 @@
 import inspect
+import time
+import orjson
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
+# One set of orjson options for responses and caches, so a payload that serialises on
+# the response path also serialises on the cache path (e.g. int dict keys)
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps_json(obj) -> bytes:
+    return orjson.dumps(obj, option=JSON_OPTIONS)
+
+
 async def maybe_await(func, *args, **kwargs) -> Any:
     """Call func which may return awaitable or normal result."""
     result = func(*args, **kwargs)
     if inspect.isawaitable(result):
         return await result
     return result
+
+
+@lru_cache(maxsize=1)
+def _format_utc_second(second: int) -> str:
+    return datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def utcnow_str() -> str:
+    """Response timestamp ("%Y-%m-%d %H:%M:%S" UTC), formatted at most once per wall-clock second"""
+    return _format_utc_second(int(time.time()))
+
+
+@lru_cache(maxsize=1)
+def _format_utc_second_iso(second: int) -> str:
+    return datetime.fromtimestamp(second, timezone.utc).isoformat()
+
+
+def utcnow_iso() -> str:
+    """ISO 8601 UTC timestamp to the second, formatted at most once per wall-clock second"""
+    return _format_utc_second_iso(int(time.time()))
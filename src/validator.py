@@ -1,4 +1,5 @@
 from difflib import SequenceMatcher
+from functools import lru_cache
 import re
 from src.logger import get_logger
 
@@ -29,6 +30,11 @@ def split_artists(artist_str: str) -> list:
     delimiters = r'\s*,\s*|\s*;\s*|\s*/\s*'
     return [normalize_string(a) for a in re.split(delimiters, artist_str) if a.strip()]
 
+@lru_cache(maxsize=4096)
+def normalize_query(artist: str, song: str) -> tuple:
+    """Pre-tokenize a requested artist/song pair once for repeated validation"""
+    return tuple(split_artists(artist)), normalize_string(song)
+
 def extract_artist_song_from_result(result: dict) -> tuple:
     """Extract artist list and song title from result dict"""
     artist = (result.get("artist") or result.get("artists") or 
@@ -45,7 +51,7 @@ def extract_artist_song_from_result(result: dict) -> tuple:
     
     return returned_artists, normalize_string(str(song or ""))
 
-def validate_lyrics_match(requested_artist: str, requested_song: str, result: dict, threshold: float = 0.5) -> dict:
+def validate_lyrics_match(requested_artist: str, requested_song: str, result: dict, threshold: float = 0.5, precomputed: tuple = None) -> dict:
     """
     ULTIMATE VALIDATOR:
     Passes if Requested Artist is found in:
@@ -53,8 +59,7 @@ def validate_lyrics_match(requested_artist: str, requested_song: str, result: di
     2. The Full Artist String (Partial check)
     3. The Song Title (Featured check)
     """
-    requested_artists = split_artists(requested_artist)
-    normalized_requested_song = normalize_string(requested_song)
+    requested_artists, normalized_requested_song = precomputed or normalize_query(requested_artist, requested_song)
     returned_artists, returned_song = extract_artist_song_from_result(result)
     
     # Get the raw string version of returned artists for partial matching
@@ -108,13 +113,13 @@ def validate_lyrics_match(requested_artist: str, requested_song: str, result: di
         "song_match": round(song_similarity, 3)
     }
 
-def validate_and_filter_results(requested_artist: str, requested_song: str, attempts: list, threshold: float = 0.5) -> dict:
+def validate_and_filter_results(requested_artist: str, requested_song: str, attempts: list, threshold: float = 0.5, precomputed: tuple = None) -> dict:
     valid_results = []
     invalid_results = []
     for attempt in attempts:
         if not isinstance(attempt, dict) or not attempt.get("success", True): continue
         if "result" in attempt and attempt["result"]:
-            val = validate_lyrics_match(requested_artist, requested_song, attempt["result"], threshold)
+            val = validate_lyrics_match(requested_artist, requested_song, attempt["result"], threshold, precomputed=precomputed)
             if val["valid"]:
                 valid_results.append({"api": attempt.get("api"), "result": attempt["result"], "validation": val})
             else: